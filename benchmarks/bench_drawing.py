@@ -0,0 +1,61 @@
+#!/usr/bin/env python3
+"""
+Drawing export benchmark
+Measures SVG/DXF shop drawings per second streamed into a zip archive
+"""
+
+import argparse
+import itertools
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+import zipfile
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from yagi_batch import BOOM_MATERIALS, OPTIMIZE_FOR, WIRE_GAUGES, evaluate, make_spec  # noqa: E402
+from yagi_drawing import write_archive  # noqa: E402
+
+
+def layouts(count):
+    """Cycle through a small set of precomputed layouts so only drawing is timed."""
+    designs = [evaluate(make_spec(f, n, g, m, o))
+               for f, n, g, m, o in itertools.product((14.2, 144.3, 1296.0), (0, 3, 8, 15),
+                                                      WIRE_GAUGES[::3], BOOM_MATERIALS[:2], OPTIMIZE_FOR[:2])]
+    for i, results in enumerate(itertools.islice(itertools.cycle(designs), count)):
+        yield f"design_{i:07d}", results['geometry'], f"Design {i}"
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--counts', default='1000,5000', help="comma-separated drawing counts")
+    parser.add_argument('--units', default='metric', choices=('metric', 'imperial'))
+    parser.add_argument('--stored', action='store_true', help="write the archive without compression")
+    parser.add_argument('--memory', action='store_true',
+                        help="also measure peak memory in a second, slower pass under tracemalloc")
+    args = parser.parse_args()
+    compression = zipfile.ZIP_STORED if args.stored else zipfile.ZIP_DEFLATED
+
+    print(f"{'formats':>8} {'drawings':>9} {'seconds':>8} {'per second':>11} {'zip MB':>7}"
+          + (f" {'peak MB':>8}" if args.memory else ""))
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, 'drawings.zip')
+        for formats in (('svg',), ('dxf',), ('svg', 'dxf')):
+            for count in (int(c) for c in args.counts.split(',')):
+                start = time.perf_counter()
+                write_archive(layouts(count), path, args.units, formats, compression)
+                elapsed = time.perf_counter() - start
+                line = (f"{'+'.join(formats):>8} {count:>9} {elapsed:>8.2f} {count / elapsed:>11.0f} "
+                        f"{os.path.getsize(path) / 1e6:>7.1f}")
+                if args.memory:
+                    tracemalloc.start()
+                    write_archive(layouts(count), path, args.units, formats, compression)
+                    line += f" {tracemalloc.get_traced_memory()[1] / 1e6:>8.1f}"
+                    tracemalloc.stop()
+                print(line)
+
+
+if __name__ == "__main__":
+    main()
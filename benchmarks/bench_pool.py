@@ -0,0 +1,64 @@
+#!/usr/bin/env python3
+"""
+Shared-memory pool benchmark
+Compares SharedMemoryPool with a plain ProcessPoolExecutor over design batches
+"""
+
+import argparse
+import itertools
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from yagi_batch import (BOOM_MATERIALS, CALCULATORS, OPTIMIZE_FOR, WIRE_GAUGES,  # noqa: E402
+                        encode_specs, evaluate, make_spec, supports)
+from yagi_pool import SharedMemoryPool  # noqa: E402
+
+
+def design_specs(count):
+    """Cycle through a grid of specs until ``count`` designs have been produced."""
+    grid = itertools.product((14.2, 50.1, 144.3, 432.1, 1296.0), range(0, 21),
+                             WIRE_GAUGES, BOOM_MATERIALS, OPTIMIZE_FOR, CALCULATORS)
+    return [make_spec(f, n, g, m, o, 25.0, c)
+            for f, n, g, m, o, c in itertools.islice(itertools.cycle([combo for combo in grid
+                                                                     if supports(combo[5], combo[3], combo[4])]),
+                                                    count)]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--sizes', default='1000,10000,100000',
+                        help="comma-separated batch sizes (up to 1000000)")
+    parser.add_argument('--workers', type=int, default=os.cpu_count())
+    parser.add_argument('--chunk-size', type=int, default=256)
+    args = parser.parse_args()
+    sizes = [int(size) for size in args.sizes.split(',')]
+
+    print(f"workers={args.workers} chunk_size={args.chunk_size}")
+    print(f"{'designs':>10} {'executor s':>12} {'shm pool s':>12} {'speedup':>8}")
+    with ProcessPoolExecutor(max_workers=args.workers) as executor, \
+            SharedMemoryPool(workers=args.workers, chunk_size=args.chunk_size) as pool:
+        # Warm both pools so process start-up is not timed
+        warmup = design_specs(args.workers * 4)
+        list(executor.map(evaluate, warmup))
+        pool.evaluate(encode_specs(warmup))
+
+        for size in sizes:
+            specs = design_specs(size)
+
+            start = time.perf_counter()
+            list(executor.map(evaluate, specs, chunksize=args.chunk_size))
+            executor_time = time.perf_counter() - start
+
+            start = time.perf_counter()
+            pool.evaluate(encode_specs(specs))
+            pool_time = time.perf_counter() - start
+
+            print(f"{size:>10} {executor_time:>12.3f} {pool_time:>12.3f} {executor_time / pool_time:>7.2f}x")
+
+
+if __name__ == '__main__':
+    main()
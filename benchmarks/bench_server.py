@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""
+Session server load test
+Drives hundreds of concurrent simulated operators against an in-process SessionServer
+"""
+
+import argparse
+import asyncio
+import os
+import random
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from yagi_server import PROMPT, SessionServer  # noqa: E402
+
+FREQUENCIES = ('14.2', '28.5', '50.1', '144.3', '432.1', '1296')
+PROMPT_BYTES = PROMPT.encode()
+
+
+def script(rng: random.Random, rounds: int):
+    """Command lines one simulated operator sends."""
+    lines = ['help']
+    for _ in range(rounds):
+        lines += [f"set frequency {rng.choice(FREQUENCIES)}",
+                  f"set directors {rng.randint(0, 12)}",
+                  f"set gauge {rng.choice(('10', '12', '14'))}",
+                  f"set optimize {rng.choice(('gain', 'bandwidth', 'f2b'))}",
+                  f"set units {rng.choice(('metric', 'imperial'))}",
+                  'calc', 'json', 'show', 'clear']
+    return lines
+
+
+async def operator(port: int, lines, latencies, errors):
+    reader, writer = await asyncio.open_connection('127.0.0.1', port)
+    try:
+        await reader.readuntil(PROMPT_BYTES)
+        for line in lines:
+            start = time.perf_counter()
+            writer.write(line.encode() + b"\n")
+            reply = await reader.readuntil(PROMPT_BYTES)
+            latencies.append(time.perf_counter() - start)
+            if reply.startswith(b"Error") or b"\nError" in reply:
+                errors.append((line, reply[:80]))
+        writer.write(b"quit\n")
+        await reader.read()
+    finally:
+        writer.close()
+        await writer.wait_closed()
+
+
+async def run(sessions: int, rounds: int, seed: int):
+    server = SessionServer(max_sessions=sessions)
+    await server.start('127.0.0.1', 0)
+    rng = random.Random(seed)
+    latencies = []
+    errors = []
+    start = time.perf_counter()
+    await asyncio.gather(*(operator(server.port, script(rng, rounds), latencies, errors)
+                           for _ in range(sessions)))
+    elapsed = time.perf_counter() - start
+    stats = server.stats()
+    await server.close()
+    return elapsed, latencies, errors, stats
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--sessions', type=int, default=300)
+    parser.add_argument('--rounds', type=int, default=5, help="design iterations per session")
+    parser.add_argument('--seed', type=int, default=1)
+    args = parser.parse_args()
+
+    elapsed, latencies, errors, stats = asyncio.run(run(args.sessions, args.rounds, args.seed))
+    latencies.sort()
+    lookups = stats['cache_hits'] + stats['cache_misses']
+    print(f"sessions:        {args.sessions} concurrent, {stats['total_sessions']} served")
+    print(f"commands:        {len(latencies)} in {elapsed:.2f} s ({len(latencies) / elapsed:.0f}/s)")
+    print(f"latency ms:      p50 {statistics.median(latencies) * 1000:.2f}  "
+          f"p99 {latencies[int(0.99 * (len(latencies) - 1))] * 1000:.2f}  max {latencies[-1] * 1000:.2f}")
+    print(f"shared cache:    {stats['cached_entries']} entries, "
+          f"{stats['cache_hits'] / lookups:.0%} hit rate" if lookups else "shared cache:    unused")
+    print(f"errors:          {len(errors)}")
+    if errors:
+        for line, reply in errors[:5]:
+            print(f"  {line!r}: {reply!r}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+"""
+CLI start-up benchmark
+Measures import time of the scripted calculator entry points with -X importtime
+and fails when a deferred module is loaded eagerly or the calculators' own import
+cost, measured against a stdlib-only reference run, exceeds the budget
+"""
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+COMMANDS = {
+    'advanced calc': ['yagi_advanced_calculator.py', 'calc', '-f', '144', '-d', '3', '--json'],
+    'non-isolated calc': ['yagi-non-isolated.py', 'calc', '-f', '144', '-d', '3', '--json'],
+}
+
+# Standard-library imports every scripted command needs; their cost depends on the
+# host, so the budget applies to the time spent on top of this reference
+REFERENCE = ['-c', 'import argparse, json']
+
+# Modules that only reports, exporters or batch tools need; loading any of them
+# for a plain scripted calculation is a start-up regression
+DEFERRED_MODULES = ('typing', 'numpy', 'multiprocessing', 'yagi_matching', 'yagi_mechanics',
+                    'yagi_batch', 'yagi_pool')
+
+
+def run_importtime(argv, env):
+    """Run one command and return (application import time in ms, imported module names)."""
+    proc = subprocess.run([sys.executable, '-X', 'importtime'] + argv, cwd=ROOT, env=env,
+                          stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True, check=True)
+    total_us = 0
+    modules = []
+    after_site = False
+    for line in proc.stderr.splitlines():
+        if not line.startswith('import time:') or 'imported package' in line:
+            continue
+        _, cumulative, name = line[len('import time:'):].split('|')
+        modules.append(name.strip())
+        if not name.startswith('  '):  # top-level import
+            if after_site:
+                total_us += int(cumulative)
+            elif name.strip() == 'site':
+                after_site = True
+    return total_us / 1000, modules
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--runs', type=int, default=20)
+    parser.add_argument('--budget-ms', type=float, default=20.0,
+                        help="median import time per command beyond the argparse/json reference run")
+    args = parser.parse_args()
+
+    # Measure with cached bytecode, as installed scripts would run
+    env = dict(os.environ)
+    env.pop('PYTHONDONTWRITEBYTECODE', None)
+
+    failures = []
+    print(f"{'command':<20} {'wall ms':>9} {'import ms':>10} {'own ms':>8} {'budget':>8}")
+    for label, argv in COMMANDS.items():
+        run_importtime(argv, env)  # warm the bytecode and file caches
+        run_importtime(REFERENCE, env)
+
+        walls = []
+        imports = []
+        own = []
+        for _ in range(args.runs):
+            start = time.perf_counter()
+            subprocess.run([sys.executable] + argv, cwd=ROOT, env=env,
+                           stdout=subprocess.DEVNULL, check=True)
+            walls.append((time.perf_counter() - start) * 1000)
+            import_ms, modules = run_importtime(argv, env)
+            reference_ms, _ = run_importtime(REFERENCE, env)
+            imports.append(import_ms)
+            own.append(import_ms - reference_ms)
+
+        wall = statistics.median(walls)
+        import_ms = statistics.median(imports)
+        own_ms = statistics.median(own)
+        status = 'ok' if own_ms <= args.budget_ms else 'OVER'
+        print(f"{label:<20} {wall:>9.1f} {import_ms:>10.1f} {own_ms:>8.1f} {status:>8}")
+        if own_ms > args.budget_ms:
+            failures.append(f"{label}: {own_ms:.1f} ms import time beyond the stdlib reference "
+                            f"exceeds {args.budget_ms:.1f} ms budget")
+        eager = sorted(set(modules) & set(DEFERRED_MODULES))
+        if eager:
+            failures.append(f"{label}: deferred modules imported at start-up: {', '.join(eager)}")
+
+    for failure in failures:
+        print(f"FAIL {failure}")
+    return 1 if failures else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+"""
+Surrogate model benchmark
+Trains the design-response surrogate and compares its batch latency and error with the reference calculators
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from yagi_batch import (CALCULATORS, OPTIMIZE_FOR, RESULT_WIDTH, SCALAR_RESULT_FIELDS,  # noqa: E402
+                        WIRE_GAUGES, encode_specs, evaluate_batch, make_spec, supports)
+from yagi_surrogate import TARGET_WIDTH, TARGETS, train_surrogate  # noqa: E402
+
+
+def random_specs(count, seed=1):
+    """Designs drawn uniformly from inside the default training domain."""
+    rng = random.Random(seed)
+    options = [(goal, calculator) for goal in OPTIMIZE_FOR for calculator in CALCULATORS
+               if supports(calculator, 'aluminum', goal)]
+    specs = []
+    for _ in range(count):
+        goal, calculator = rng.choice(options)
+        specs.append(make_spec(10 ** rng.uniform(1.16, 3.11), rng.randint(0, 15), rng.choice(WIRE_GAUGES),
+                               'aluminum', goal, rng.uniform(15.0, 40.0), calculator))
+    return specs
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--count', type=int, default=20000, help="designs to predict")
+    parser.add_argument('--degree', type=int, default=3)
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    surrogate = train_surrogate(degree=args.degree)
+    print(f"trained {len(surrogate.models)} models in {time.perf_counter() - start:.2f} s")
+    for group, errors in sorted(surrogate.validation().items()):
+        summary = "  ".join(f"{target}={errors[target]['max_error']:.2f}" for target in TARGETS)
+        print(f"  {group:<24} hold-out max error: {summary}")
+
+    rows = encode_specs(random_specs(args.count))
+    start = time.perf_counter()
+    predicted, mask = surrogate.predict_batch(rows)
+    surrogate_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    reference = evaluate_batch(rows)
+    reference_time = time.perf_counter() - start
+
+    columns = [SCALAR_RESULT_FIELDS.index(target) for target in TARGETS]
+    worst = [0.0] * TARGET_WIDTH
+    for i in range(args.count):
+        for k, column in enumerate(columns):
+            error = abs(predicted[i * TARGET_WIDTH + k] - reference[i * RESULT_WIDTH + column])
+            worst[k] = max(worst[k], error)
+
+    print(f"\n{'designs':>10} {'surrogate µs':>13} {'reference µs':>13} {'speedup':>8} {'fallbacks':>10}")
+    print(f"{args.count:>10} {surrogate_time / args.count * 1e6:>13.1f} "
+          f"{reference_time / args.count * 1e6:>13.1f} {reference_time / surrogate_time:>7.2f}x "
+          f"{args.count - sum(mask):>10}")
+    print("max error vs reference: " + "  ".join(f"{t}={e:.2f}" for t, e in zip(TARGETS, worst)))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,362 @@
+#!/usr/bin/env python3
+"""
+Fast-path equivalence check
+Differential test of every batch, pooled, streamed, cached and table-driven path against the
+scalar calculate_yagi / calculate_antenna reference on random specs, with throughput per path
+"""
+
+import argparse
+import json
+import math
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from yagi_advanced_calculator import YagiCalculator  # noqa: E402
+from yagi_batch import (BOOM_MATERIALS, CALCULATORS, ELEMENT_CONDUCTORS, MAX_DIRECTORS,  # noqa: E402
+                        OPTIMIZE_FOR, RESULT_WIDTH, SCALAR_RESULT_FIELDS, WIRE_GAUGES, decode_result, encode_specs,
+                        evaluate, evaluate_batch, load_non_isolated, make_spec, supports)
+
+# Fields compared for every design path; the session server only reports the calculator's own fields
+FIELDS = SCALAR_RESULT_FIELDS + ('director_lengths', 'director_spacings')
+MATERIAL_FIELDS = ('conductor_loss_db', 'resonant_frequency')
+DESIGN_FIELDS = tuple(field for field in FIELDS if field not in MATERIAL_FIELDS)
+
+# Paths that reuse the reference code must agree to rounding; estimators get absolute limits
+EXACT = 1e-9
+# Batch conductor loss (dB) and resonance (MHz) come from the interpolated tables checked below
+MATERIAL_TOLERANCE = 1e-4
+SURROGATE_TOLERANCE = {'gain': 0.5, 'front_to_back': 2.5, 'beamwidth': 3.0, 'input_impedance': 1.0}
+# Relative; linear interpolation of the skin-depth factor (a square root of resistivity) on the
+# 1 °C grid is off by at most (temp_coefficient * TABLE_STEP)**2 / 8, about 5e-6 for steel
+TABLE_TOLERANCE = 1e-5
+
+
+def random_specs(count: int, seed: int):
+    """Valid specs covering every gauge, material, mode and calculator that models them, with random continuous inputs."""
+    rng = random.Random(seed)
+    combos = [(g, m, o, c) for g in WIRE_GAUGES for m in BOOM_MATERIALS for o in OPTIMIZE_FOR for c in CALCULATORS
+              if supports(c, m, o)]
+    rng.shuffle(combos)
+    specs = []
+    for i in range(count):
+        gauge, material, mode, calculator = combos[i % len(combos)]
+        frequency = round(10 ** rng.uniform(math.log10(1.8), math.log10(3000.0)), 4)
+        specs.append(make_spec(frequency, rng.randint(0, MAX_DIRECTORS), gauge, material, mode,
+                               round(rng.uniform(10.0, 60.0), 2), calculator, rng.choice(ELEMENT_CONDUCTORS),
+                               round(rng.uniform(-40.0, 85.0), 1)))
+    return specs
+
+
+def reference(specs):
+    """Scalar reference, independent of yagi_batch: a fresh calculator per design, called directly
+    as the interactive tools call it, plus the conductor loss and resonance from the closed-form
+    material formulas at the spec's temperature.
+
+    Every path, the batched ones included, is compared against these results rather than
+    against yagi_batch.evaluate, so a fault in the shared batch code shows up as a deviation.
+    """
+    module = load_non_isolated()
+    out = []
+    for spec in specs:
+        if spec['calculator'] == 'non_isolated':
+            calculator = module.NonIsolatedYagiCalculator()
+            calculator.frequency_mhz = spec['frequency']
+            calculator.num_directors = spec['num_directors']
+            calculator.wire_gauge = spec['wire_gauge']
+            calculator.boom_diameter_mm = spec['boom_diameter_mm']
+            calculator.optimize_for = spec['optimize_for']
+            results = calculator.calculate_antenna()
+        else:
+            parameters = {'num_directors': spec['num_directors'], 'wire_gauge': spec['wire_gauge'],
+                          'boom_material': spec['boom_material'], 'optimize_for': spec['optimize_for']}
+            results = YagiCalculator().calculate_yagi(spec['frequency'], parameters)
+        results.update(material_reference(results, spec))
+        out.append(results)
+    return out
+
+
+def material_reference(results, spec):
+    """Loss and resonance of a design without the interpolated conductor tables."""
+    from yagi_materials import CONDUCTORS, MU0, REFERENCE_TEMPERATURE
+
+    props = CONDUCTORS[spec['conductor']]
+    delta_t = spec['temperature'] - REFERENCE_TEMPERATURE
+    rho = props['resistivity'] * (1 + props['temp_coefficient'] * delta_t)
+    skin = math.sqrt(rho / (math.pi * spec['frequency'] * 1e6 * MU0 * props['permeability']))
+    d = results['wire_diameter']
+    per_meter = rho / (math.pi * d ** 2 / 4) if skin >= d / 2 else rho / (math.pi * skin * (d - skin))
+    lengths = list(results['geometry'].lengths)
+    r = results['input_impedance']
+    if min(lengths) <= 0 or r <= 0:
+        loss = math.nan
+    else:
+        loss = -10 * math.log10(r / (r + per_meter * sum(lengths) / 2))
+    return {'conductor_loss_db': loss,
+            'resonant_frequency': spec['frequency'] / (1 + props['expansion'] * delta_t)}
+
+
+def deviation(expected, actual, fields) -> float:
+    """Largest absolute difference over the given fields of two result dicts; NaN only matches NaN."""
+    worst = 0.0
+    for field in fields:
+        a, b = expected[field], actual[field]
+        pairs = zip(a, b) if isinstance(a, list) else ((a, b),)
+        if isinstance(a, list) and len(a) != len(b):
+            return math.inf
+        for x, y in pairs:
+            if math.isnan(x) or math.isnan(y):
+                if not (math.isnan(x) and math.isnan(y)):
+                    return math.inf
+                continue
+            worst = max(worst, abs(x - y))
+    return worst
+
+
+def unpack(specs, results):
+    return [decode_result(results[i * RESULT_WIDTH:(i + 1) * RESULT_WIDTH], spec['num_directors'])
+            for i, spec in enumerate(specs)]
+
+
+# Each design path maps specs to result dicts holding at least FIELDS
+
+
+def path_evaluate(specs):
+    return [evaluate(spec) for spec in specs]
+
+
+def path_batch(specs):
+    return unpack(specs, evaluate_batch(encode_specs(specs)))
+
+
+def path_pool(specs, workers):
+    from yagi_pool import SharedMemoryPool
+
+    with SharedMemoryPool(workers=workers, chunk_size=128) as pool:
+        return unpack(specs, pool.evaluate(encode_specs(specs)))
+
+
+def path_stream(specs):
+    from yagi_stream import evaluate_chunks, pack, records
+
+    return list(records(evaluate_chunks(pack(specs, 256))))
+
+
+def path_cache(specs, directory, warm):
+    from yagi_cache import ChunkCache, evaluate_cached
+    from yagi_stream import pack, records
+
+    cache = ChunkCache(directory)
+    out = list(records(evaluate_cached(pack(specs, 256), cache)))
+    if warm and cache.misses:
+        raise AssertionError(f"{cache.misses} chunks missed a warm cache")
+    return out
+
+
+def path_geometry_batch(specs):
+    from yagi_geometry import GeometryBatch
+
+    designs = [evaluate(spec) for spec in specs]
+    batch = GeometryBatch()
+    batch.extend(d['geometry'] for d in designs)
+    out = []
+    booms = batch.boom_lengths()
+    for i in range(len(designs)):
+        geometry = batch[i]
+        out.append({'total_boom': booms[i], 'director_spacings': geometry.director_spacings(),
+                    'director_lengths': list(geometry.lengths[2:])})
+    return out
+
+
+def server_specs(specs):
+    """Indexes of the specs a server session can express: it hosts the non-isolated calculator."""
+    return [i for i, spec in enumerate(specs) if spec['calculator'] == 'non_isolated']
+
+
+def surrogate_split(specs, surrogate):
+    """Indexes of the specs the surrogate serves itself, and of those it hands to the reference.
+
+    The two sets are checked separately: served rows against the surrogate tolerances, and
+    fallback rows for exact agreement with yagi_batch.evaluate.
+    """
+    _, mask = surrogate.predict_batch(encode_specs(specs))
+    served = [i for i, flag in enumerate(mask) if flag]
+    fallback = [i for i, flag in enumerate(mask) if not flag]
+    print(f"{'':<24} surrogate serves {len(served)} of {len(specs)} specs, "
+          f"{len(fallback)} fall back to the reference")
+    return served, fallback
+
+
+def path_server(specs):
+    from yagi_server import DesignCache, Session
+
+    out = []
+    cache = DesignCache()
+    session = Session(1, cache)
+    for spec in specs:
+        for command in (f"set frequency {spec['frequency']!r}", f"set directors {spec['num_directors']}",
+                        f"set gauge {spec['wire_gauge']}", f"set boom {spec['boom_diameter_mm']!r}",
+                        f"set optimize {spec['optimize_for']}"):
+            reply, _ = session.handle(command)
+            if reply.startswith('Error'):
+                raise AssertionError(f"{command}: {reply}")
+        reply, _ = session.handle('json')
+        out.append(json.loads(reply))
+    return out
+
+
+def path_surrogate(specs, surrogate):
+    from yagi_surrogate import TARGET_WIDTH, TARGETS
+
+    predicted, mask = surrogate.predict_batch(encode_specs(specs))
+    if not all(mask):
+        raise AssertionError(f"{len(mask) - sum(mask)} specs fell back to the reference")
+    return [dict(zip(TARGETS, predicted[i * TARGET_WIDTH:(i + 1) * TARGET_WIDTH])) for i in range(len(specs))]
+
+
+def path_surrogate_fallback(specs, surrogate):
+    from yagi_surrogate import TARGET_WIDTH, TARGETS
+
+    predicted, mask = surrogate.predict_batch(encode_specs(specs))
+    if any(mask):
+        raise AssertionError(f"{sum(mask)} out-of-domain specs were served by the surrogate")
+    out = [dict(zip(TARGETS, predicted[i * TARGET_WIDTH:(i + 1) * TARGET_WIDTH])) for i in range(len(specs))]
+    differing = sum(1 for spec, row in zip(specs, out)
+                    if any(row[target] != evaluate(spec)[target] for target in TARGETS))
+    if differing:
+        raise AssertionError(f"{differing} fallback rows differ from yagi_batch.evaluate")
+    return out
+
+
+def check_materials(count, seed):
+    """Interpolated conductor tables against the closed-form resistivity and skin depth."""
+    from yagi_materials import CONDUCTORS, MU0, REFERENCE_TEMPERATURE, loss_resistance_batch
+
+    rng = random.Random(seed)
+    worst = 0.0
+    elapsed = 0.0
+    for name, props in CONDUCTORS.items():
+        lengths = [rng.uniform(0.05, 20.0) for _ in range(count)]
+        diameters = [rng.uniform(0.0005, 0.03) for _ in range(count)]
+        frequencies = [10 ** rng.uniform(0, 4) for _ in range(count)]
+        temperatures = [rng.uniform(-40.0, 85.0) for _ in range(count)]
+        start = time.perf_counter()
+        fast = loss_resistance_batch(lengths, diameters, frequencies, temperatures, name)
+        elapsed += time.perf_counter() - start
+        for length, d, f, t, value in zip(lengths, diameters, frequencies, temperatures, fast):
+            rho = props['resistivity'] * (1 + props['temp_coefficient'] * (t - REFERENCE_TEMPERATURE))
+            delta = math.sqrt(rho / (math.pi * f * 1e6 * MU0 * props['permeability']))
+            per_meter = (rho / (math.pi * d ** 2 / 4) if delta >= d / 2
+                         else rho / (math.pi * delta * (d - delta)))
+            worst = max(worst, abs(value - per_meter * length / 2) / (per_meter * length / 2))
+    return count * len(CONDUCTORS), elapsed, worst
+
+
+def check_bands(count, seed):
+    """Merge-pass lookup_batch against one bisect lookup per frequency."""
+    from yagi_bands import REGIONS, default_band_plan
+
+    plan = default_band_plan()
+    rng = random.Random(seed)
+    mismatches = 0
+    elapsed = 0.0
+    for region in REGIONS:
+        frequencies = sorted(10 ** rng.uniform(-1, 5.5) for _ in range(count))
+        start = time.perf_counter()
+        fast = plan.lookup_batch(frequencies, region)
+        elapsed += time.perf_counter() - start
+        mismatches += sum(1 for f, band in zip(frequencies, fast) if band is not plan.lookup(f, region))
+    return count * len(REGIONS), elapsed, float(mismatches)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--count', type=int, default=3000, help="random specs per path")
+    parser.add_argument('--seed', type=int, default=2024)
+    parser.add_argument('--workers', type=int, default=2, help="workers for the shared-memory pool path")
+    args = parser.parse_args()
+
+    specs = random_specs(args.count, args.seed)
+    start = time.perf_counter()
+    expected = reference(specs)
+    reference_time = time.perf_counter() - start
+
+    from yagi_surrogate import TARGETS, train_surrogate
+
+    surrogate = train_surrogate()
+    served, fallback = surrogate_split(specs, surrogate)
+    cache_dir = tempfile.TemporaryDirectory()
+    # (name, run, fields compared, tolerance, indexes of the specs the path can take)
+    paths = [
+        ('batch.evaluate', path_evaluate, FIELDS, EXACT, None),
+        ('batch.evaluate_batch', path_batch, FIELDS, EXACT, None),
+        ('pool (shared memory)', lambda s: path_pool(s, args.workers), FIELDS, EXACT, None),
+        ('stream pipeline', path_stream, FIELDS, EXACT, None),
+        ('cache (cold)', lambda s: path_cache(s, cache_dir.name, False), FIELDS, EXACT, None),
+        ('cache (warm)', lambda s: path_cache(s, cache_dir.name, True), FIELDS, EXACT, None),
+        ('geometry batch', path_geometry_batch, ('total_boom', 'director_lengths', 'director_spacings'), EXACT, None),
+        ('server session', path_server, DESIGN_FIELDS, EXACT, server_specs),
+        ('surrogate', lambda s: path_surrogate(s, surrogate), TARGETS, SURROGATE_TOLERANCE, lambda s: served),
+        ('surrogate fallback', lambda s: path_surrogate_fallback(s, surrogate), TARGETS, EXACT, lambda s: fallback),
+    ]
+
+    print(f"{'path':<24} {'designs':>8} {'per second':>11} {'max deviation':>14} {'tolerance':>10}  result")
+    print(f"{'reference (scalar)':<24} {len(specs):>8} {len(specs) / reference_time:>11.0f}")
+    failures = []
+    try:
+        for name, run, fields, tolerance, select in paths:
+            chosen = range(len(specs)) if select is None else select(specs)
+            subset = [specs[i] for i in chosen]
+            wanted = [expected[i] for i in chosen]
+            start = time.perf_counter()
+            try:
+                actual = run(subset)
+            except Exception as e:  # a crashing path is a failed path
+                print(f"{name:<24} {'':>8} {'':>11} {'':>14} {'':>10}  FAIL ({type(e).__name__}: {e})")
+                failures.append(name)
+                continue
+            elapsed = time.perf_counter() - start
+            note = ""
+            if isinstance(tolerance, dict):
+                worst = {field: max((deviation(e, a, (field,)) for e, a in zip(wanted, actual)), default=0.0)
+                         for field in fields}
+                ok = all(worst[field] <= tolerance[field] for field in fields)
+                shown = max(worst.values())
+                limit = "per field"
+            else:
+                design = [field for field in fields if field not in MATERIAL_FIELDS]
+                material = [field for field in fields if field in MATERIAL_FIELDS]
+                shown = max((deviation(e, a, design) for e, a in zip(wanted, actual)), default=0.0)
+                worst_material = max((deviation(e, a, material) for e, a in zip(wanted, actual)), default=0.0)
+                ok = shown <= tolerance and worst_material <= MATERIAL_TOLERANCE and len(actual) == len(wanted)
+                limit = f"{tolerance:g}"
+                if material:
+                    note = f" (materials {worst_material:.3g} of {MATERIAL_TOLERANCE:g})"
+            print(f"{name:<24} {len(actual):>8} {len(actual) / elapsed:>11.0f} {shown:>14.3g} {limit:>10}  "
+                  f"{'ok' if ok else 'FAIL'}{note}")
+            if not ok:
+                failures.append(name)
+    finally:
+        cache_dir.cleanup()
+
+    for name, check, tolerance in (('material tables', check_materials, TABLE_TOLERANCE),
+                                   ('band lookup_batch', check_bands, 0.0)):
+        count, elapsed, worst = check(args.count, args.seed)
+        ok = worst <= tolerance
+        print(f"{name:<24} {count:>8} {count / elapsed:>11.0f} {worst:>14.3g} {tolerance:>10g}  "
+              f"{'ok' if ok else 'FAIL'}")
+        if not ok:
+            failures.append(name)
+
+    if failures:
+        print(f"\nFAILED: {', '.join(failures)}")
+        sys.exit(1)
+    print("\nAll fast paths match the reference within tolerance")
+
+
+if __name__ == "__main__":
+    main()
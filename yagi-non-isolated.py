@@ -1,13 +1,15 @@
 import math
-import sys
 import os
-from typing import Dict, List, Tuple, Optional
+import sys
+
+from yagi_geometry import ElementGeometry
 
 class NonIsolatedYagiCalculator:
     """Advanced Yagi antenna calculator for non-isolated aluminum booms with multiple optimization modes."""
     
     # Constants
     SPEED_OF_LIGHT = 299792458  # meters per second
+    DESIGN_WIND_KMH = 100  # wind speed used for the mechanical summary
     
     # Wire diameter lookup table (in mm)
     WIRE_GAUGES = {
@@ -27,6 +29,7 @@ class NonIsolatedYagiCalculator:
         self.boom_diameter_mm = 25.0  # Default boom diameter in mm
         self.optimize_for = 'gain'
         self.units = 'metric'
+        self.itu_region = 2  # band plan region shown when setting the frequency
         # Fixed for this calculator
         self.boom_material = 'aluminum_non_isolated'
         
@@ -68,14 +71,14 @@ class NonIsolatedYagiCalculator:
             
     def set_frequency(self):
         """Set the operating frequency."""
+        from yagi_bands import default_band_plan, describe_frequency
+        
         print("\nSET FREQUENCY")
         print("-" * 20)
-        print("Common amateur radio frequencies:")
-        print("  - 28.5 MHz (10m)")
-        print("  - 50.0 MHz (6m)")  
-        print("  - 144.0 MHz (2m)")
-        print("  - 432.0 MHz (70cm)")
-        print("  - 1296.0 MHz (23cm)")
+        print(f"Amateur bands (ITU Region {self.itu_region}):")
+        bands = default_band_plan().bands(self.itu_region)
+        for i in range(0, len(bands), 3):
+            print("  " + "".join(f"{band.name + ':':<7}{f'{band.low:g}-{band.high:g} MHz':<22}" for band in bands[i:i + 3]))
         print()
         
         while True:
@@ -92,6 +95,7 @@ class NonIsolatedYagiCalculator:
                         
                 self.frequency_mhz = freq
                 print(f"✓ Frequency set to {freq} MHz")
+                print(f"  {describe_frequency(freq, self.itu_region)}")
                 break
                 
             except ValueError:
@@ -254,8 +258,8 @@ class NonIsolatedYagiCalculator:
                 remaining_inches = inches % 12
                 return f"{feet}' {remaining_inches:.2f}\""
                 
-    def calculate_antenna(self) -> Optional[Dict]:
-        """Calculate antenna dimensions and performance for non-isolated aluminum boom."""
+    def calculate_antenna(self) -> dict:
+        """Calculate antenna dimensions and performance for non-isolated aluminum boom; None without a frequency."""
         if self.frequency_mhz <= 0:
             print("Error: Please set a valid frequency first!")
             return None
@@ -335,8 +339,14 @@ class NonIsolatedYagiCalculator:
         front_to_back = min(front_to_back, 35)
         beamwidth = max(beamwidth, 15)
         
+        # Element layout; director spacings are measured from the driven element,
+        # so the boom ends at the last director rather than at the sum of spacings
+        geometry = ElementGeometry.from_yagi(reflector_length, driven_length, director_lengths,
+                                             reflector_spacing, director_spacings)
+        director_spacings = geometry.director_spacings()
+        
         # Calculate additional parameters
-        total_boom = reflector_spacing + (sum(director_spacings) if director_spacings else 0)
+        total_boom = geometry.boom_length
         input_impedance = 28 + (self.num_directors * 4) + (reflector_spacing / wavelength * 50)
         
         return {
@@ -352,11 +362,17 @@ class NonIsolatedYagiCalculator:
             'beamwidth': beamwidth,
             'input_impedance': input_impedance,
             'wire_diameter': wire_diameter,
-            'boom_correction_mm': bc_mm
+            'boom_correction_mm': bc_mm,
+            'geometry': geometry
         }
         
-    def display_results(self, results: Dict):
+    def display_results(self, results: dict):
         """Display calculation results."""
+        # Report-only modules are imported on demand to keep scripted start-up fast
+        from yagi_matching import matching_summary
+        from yagi_materials import materials_summary
+        from yagi_mechanics import mechanical_summary
+        
         print("\n" + "=" * 60)
         print("                    CALCULATION RESULTS")
         print("=" * 60)
@@ -390,6 +406,27 @@ class NonIsolatedYagiCalculator:
         print(f"\nTOTAL BOOM LENGTH:   {self.convert_length(results['total_boom'])}")
         print(f"Boom Correction Applied: {results['boom_correction_mm']:.2f} mm (added to reflector and directors)")
         
+        print("\nMOUNTING POINTS (from reflector end):")
+        print("-" * 37)
+        for label, position in zip(results['geometry'].labels(), results['geometry'].mounting_points()):
+            print(f"{label + ':':<21}{self.convert_length(position)}")
+        
+        print("\nFEEDPOINT MATCHING:")
+        print("-" * 19)
+        for line in matching_summary(results, self.frequency_mhz, self.optimize_for, self.convert_length):
+            print(line)
+        
+        print(f"\nMECHANICAL ({self.DESIGN_WIND_KMH} km/h wind, mast clamp at boom center):")
+        print("-" * 55)
+        for line in mechanical_summary(results['geometry'], self.boom_diameter_mm / 1000, results['wire_diameter'],
+                                       self.DESIGN_WIND_KMH, self.convert_length, self.boom_material):
+            print(line)
+        
+        print("\nMATERIALS & TEMPERATURE:")
+        print("-" * 24)
+        for line in materials_summary(results, self.frequency_mhz, self.convert_length):
+            print(line)
+        
         # Construction notes
         print("\nCONSTRUCTION NOTES:")
         print("-" * 19)
@@ -406,12 +443,17 @@ class NonIsolatedYagiCalculator:
         opt_name = self.optimize_for.replace('_', ' ').title()
         print(f"\n* Optimized for: {opt_name}")
         
-    def export_results(self, results: Dict):
+    def export_results(self, results: dict):
         """Export results to a text file."""
         if not results:
             print("Error: No results to export! Please calculate first.")
             return
             
+        from yagi_drawing import render_dxf, render_svg
+        from yagi_matching import matching_summary
+        from yagi_materials import materials_summary
+        from yagi_mechanics import mechanical_summary
+        
         filename = f"non_isolated_yagi_{self.frequency_mhz}MHz_{self.num_directors}dir.txt"
         
         try:
@@ -454,7 +496,43 @@ class NonIsolatedYagiCalculator:
                 f.write(f"\nTotal Boom Length: {self.convert_length(results['total_boom'])}\n")
                 f.write(f"Boom Correction: {results['boom_correction_mm']:.2f} mm (added to reflector and directors)\n")
                 
+                f.write("\nMOUNTING POINTS (from reflector end):\n")
+                f.write("-" * 37 + "\n")
+                for label, position in zip(results['geometry'].labels(), results['geometry'].mounting_points()):
+                    f.write(f"{label}: {self.convert_length(position)}\n")
+                    
+                f.write("\nFEEDPOINT MATCHING:\n")
+                f.write("-" * 19 + "\n")
+                for line in matching_summary(results, self.frequency_mhz, self.optimize_for, self.convert_length):
+                    f.write(line + "\n")
+                
+                f.write(f"\nMECHANICAL ({self.DESIGN_WIND_KMH} km/h wind, mast clamp at boom center):\n")
+                f.write("-" * 55 + "\n")
+                for line in mechanical_summary(results['geometry'], self.boom_diameter_mm / 1000,
+                                               results['wire_diameter'], self.DESIGN_WIND_KMH, self.convert_length,
+                                               self.boom_material):
+                    f.write(line + "\n")
+                
+                f.write("\nMATERIALS & TEMPERATURE:\n")
+                f.write("-" * 24 + "\n")
+                for line in materials_summary(results, self.frequency_mhz, self.convert_length):
+                    f.write(line + "\n")
+                    
+            nec_filename = filename[:-len('.txt')] + '.nec'
+            with open(nec_filename, 'w') as f:
+                f.write(results['geometry'].to_nec(self.frequency_mhz, results['wire_diameter'],
+                                                   comment=f"Non-isolated Yagi {self.frequency_mhz} MHz, {self.num_directors} directors"))
+            
+            # Shop drawings use the same dimension text as the report
+            title = f"Non-isolated Yagi {self.frequency_mhz} MHz, {self.num_directors} directors, {self.wire_gauge} AWG"
+            drawing_base = filename[:-len('.txt')]
+            for extension, render in (('.svg', render_svg), ('.dxf', render_dxf)):
+                with open(drawing_base + extension, 'w') as f:
+                    f.write(render(results['geometry'], self.units, title, self.convert_length))
+                
             print(f"✓ Results exported to {filename}")
+            print(f"✓ NEC model exported to {nec_filename}")
+            print(f"✓ Drawings exported to {drawing_base}.svg and {drawing_base}.dxf")
             
         except IOError as e:
             print(f"Error exporting file: {e}")
@@ -510,9 +588,78 @@ class NonIsolatedYagiCalculator:
                 input("\nPress Enter to continue...")
 
 
-def main():
+def build_parser():
+    """Build the command-line parser for scripted use (argparse is imported only when needed)."""
+    import argparse
+    
+    parser = argparse.ArgumentParser(description="Yagi calculator for non-isolated aluminum booms")
+    subparsers = parser.add_subparsers(dest='command')
+    subparsers.add_parser('interactive', help="run the interactive menu (default)")
+    for name, help_text in (('calc', "print the design for the given parameters"),
+                            ('export', "write the results NEC model and SVG/DXF drawings")):
+        sub = subparsers.add_parser(name, help=help_text)
+        sub.add_argument('-f', '--frequency', type=float, required=True, help="frequency in MHz")
+        sub.add_argument('-d', '--directors', type=int, default=0, choices=range(21), metavar='{0-20}',
+                         help="number of directors")
+        sub.add_argument('-g', '--gauge', default='14', choices=list(NonIsolatedYagiCalculator.WIRE_GAUGES),
+                         help="wire gauge (AWG)")
+        sub.add_argument('-b', '--boom-diameter', type=float, default=25.0, help="boom diameter in mm")
+        sub.add_argument('-o', '--optimize', default='gain', choices=['gain', 'bandwidth', 'f2b'],
+                         help="optimization mode")
+        sub.add_argument('-u', '--units', default='metric', choices=['metric', 'imperial'])
+        if name == 'calc':
+            sub.add_argument('--json', action='store_true', help="print the results as JSON")
+    return parser
+
+
+def run_command(argv: list):
+    """Run one scripted subcommand."""
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    calculator = NonIsolatedYagiCalculator()
+    if args.command in (None, 'interactive'):
+        calculator.run()
+        return
+    if args.frequency <= 0:
+        parser.error("frequency must be positive")
+    if args.boom_diameter <= 0:
+        parser.error("boom diameter must be positive")
+        
+    calculator.frequency_mhz = args.frequency
+    calculator.num_directors = args.directors
+    calculator.wire_gauge = args.gauge
+    calculator.boom_diameter_mm = args.boom_diameter
+    calculator.optimize_for = args.optimize
+    calculator.units = args.units
+    results = calculator.calculate_antenna()
+    
+    if args.command == 'export':
+        calculator.export_results(results)
+    elif args.json:
+        import json
+        
+        parameters = {
+            'num_directors': args.directors,
+            'wire_gauge': args.gauge,
+            'boom_diameter_mm': args.boom_diameter,
+            'optimize_for': args.optimize,
+            'units': args.units
+        }
+        output = {key: value for key, value in results.items() if key != 'geometry'}
+        output['element_positions'] = list(results['geometry'].positions)
+        print(json.dumps({'frequency': args.frequency, 'parameters': parameters, 'results': output}))
+    else:
+        calculator.display_results(results)
+
+
+def main(argv=None):
     """Main entry point."""
+    if argv is None:
+        argv = sys.argv[1:]
     try:
+        if argv:
+            run_command(argv)
+            return
         calculator = NonIsolatedYagiCalculator()
         calculator.run()
     except KeyboardInterrupt:
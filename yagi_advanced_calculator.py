@@ -7,6 +7,8 @@ Professional-grade antenna design tool for amateur radio enthusiasts
 import math
 import sys
 
+from yagi_geometry import ElementGeometry
+
 class YagiCalculator:
     def __init__(self):
         # Physical constants
@@ -32,14 +34,11 @@ class YagiCalculator:
             'carbon_fiber': 0.96
         }
         
-        # Popular amateur radio bands
-        self.POPULAR_BANDS = {
-            '1': ('6m', 50.0, 54.0),
-            '2': ('2m', 144.0, 148.0),
-            '3': ('70cm', 420.0, 450.0),
-            '4': ('23cm', 1240.0, 1300.0),
-            '5': ('13cm', 2300.0, 2450.0)
-        }
+        # ITU region offered first when choosing from the band plan (yagi_bandplan.json)
+        self.ITU_REGION = 2
+        
+        # Boom size assumed when estimating dielectric loading of insulating booms
+        self.BOOM_DIAMETER_MM = 25
 
     def display_banner(self):
         """Display the application banner"""
@@ -51,10 +50,13 @@ class YagiCalculator:
 
     def get_frequency_input(self):
         """Get frequency input from user with band selection option"""
+        # The band plan is only loaded for interactive use
+        from yagi_bands import default_band_plan, describe_frequency
+        
         print("FREQUENCY SELECTION")
         print("-" * 30)
         print("1. Enter specific frequency")
-        print("2. Select from popular amateur bands")
+        print("2. Select from amateur bands")
         print()
         
         while True:
@@ -67,27 +69,37 @@ class YagiCalculator:
                         if freq <= 0:
                             print("Error: Frequency must be positive")
                             continue
+                        print(describe_frequency(freq, self.ITU_REGION))
                         return freq
                     except ValueError:
                         print("Error: Please enter a valid number")
                         
             elif choice == '2':
-                print("\nPOPULAR AMATEUR BANDS:")
-                for key, (band, low, high) in self.POPULAR_BANDS.items():
-                    print(f"{key}. {band} band ({low}-{high} MHz)")
+                region = input(f"ITU region (1-3) [{self.ITU_REGION}]: ").strip()
+                if region in ('1', '2', '3'):
+                    self.ITU_REGION = int(region)
+                bands = default_band_plan().bands(self.ITU_REGION)
+                
+                print(f"\nAMATEUR BANDS (ITU Region {self.ITU_REGION}):")
+                for i, band in enumerate(bands, start=1):
+                    print(f"{i}. {band.name} band ({band.low}-{band.high} MHz)")
                 
-                band_choice = input("\nSelect band (1-5): ").strip()
-                if band_choice in self.POPULAR_BANDS:
-                    band_name, low, high = self.POPULAR_BANDS[band_choice]
-                    center_freq = (low + high) / 2
+                band_choice = input(f"\nSelect band (1-{len(bands)}): ").strip()
+                if band_choice.isdigit() and 1 <= int(band_choice) <= len(bands):
+                    band = bands[int(band_choice) - 1]
+                    band_name, low, high = band.name, band.low, band.high
+                    center_freq = round(band.center, 4)
                     print(f"Using {band_name} center frequency: {center_freq} MHz")
                     
                     custom = input(f"Use custom frequency in {band_name} band? (y/n): ").lower()
                     if custom == 'y':
+                        print("Segments: " + ", ".join(f"{seg_low}-{seg_high} {mode}"
+                                                       for seg_low, seg_high, mode in band.segments))
                         while True:
                             try:
                                 freq = float(input(f"Enter frequency ({low}-{high} MHz): "))
                                 if low <= freq <= high:
+                                    print(describe_frequency(freq, self.ITU_REGION))
                                     return freq
                                 else:
                                     print(f"Error: Frequency must be between {low} and {high} MHz")
@@ -273,8 +285,13 @@ class YagiCalculator:
             front_to_back = 14 + (num_dirs * 2.8)
             beamwidth = max(26, 67 - (num_dirs * 3.8))
         
+        # Element layout; spacings and boom length are derived from absolute positions
+        geometry = ElementGeometry.from_yagi(reflector_length, driven_length, director_lengths,
+                                             reflector_spacing, director_spacings)
+        director_spacings = geometry.director_spacings()
+        
         # Calculate additional parameters
-        total_boom = reflector_spacing + (director_spacings[-1] if director_spacings else 0)
+        total_boom = geometry.boom_length
         input_impedance = 28 + (num_dirs * 4) + (reflector_spacing / wavelength * 50)
         
         # Apply realistic limits
@@ -295,7 +312,8 @@ class YagiCalculator:
             'beamwidth': beamwidth,
             'input_impedance': input_impedance,
             'wire_diameter': wire_diameter,
-            'end_effect': end_effect
+            'end_effect': end_effect,
+            'geometry': geometry
         }
 
     def format_length(self, meters, units):
@@ -318,6 +336,10 @@ class YagiCalculator:
 
     def display_results(self, frequency, parameters, results):
         """Display calculation results in a formatted manner"""
+        # Report-only modules are imported on demand to keep scripted start-up fast
+        from yagi_matching import matching_summary
+        from yagi_materials import materials_summary
+        
         print("\n" + "=" * 70)
         print("                    CALCULATION RESULTS")
         print("=" * 70)
@@ -359,6 +381,30 @@ class YagiCalculator:
         
         print(f"\nTotal Boom Length:     {self.format_length(results['total_boom'], parameters['units'])}")
         
+        # Mounting points
+        print("\n" + "-" * 40)
+        print("     MOUNTING POINTS (from reflector end)")
+        print("-" * 40)
+        for label, position in zip(results['geometry'].labels(), results['geometry'].mounting_points()):
+            print(f"{label:<23}{self.format_length(position, parameters['units'])}")
+        
+        # Feedpoint matching
+        print("\n" + "-" * 40)
+        print("           FEEDPOINT MATCHING")
+        print("-" * 40)
+        for line in matching_summary(results, frequency, parameters['optimize_for'],
+                                     lambda m: self.format_length(m, parameters['units'])):
+            print(line)
+        
+        # Materials and temperature
+        print("\n" + "-" * 40)
+        print("       MATERIALS & TEMPERATURE")
+        print("-" * 40)
+        for line in materials_summary(results, frequency, lambda m: self.format_length(m, parameters['units']),
+                                      boom_material=parameters['boom_material'],
+                                      boom_diameter=self.BOOM_DIAMETER_MM / 1000):
+            print(line)
+        
         # Construction notes
         print("\n" + "-" * 40)
         print("           CONSTRUCTION NOTES")
@@ -375,6 +421,10 @@ class YagiCalculator:
 
     def save_results(self, frequency, parameters, results):
         """Save results to a file"""
+        from yagi_drawing import render_dxf, render_svg
+        from yagi_matching import matching_summary
+        from yagi_materials import materials_summary
+        
         filename = f"yagi_{frequency}MHz_{parameters['num_directors']}dir.txt"
         
         try:
@@ -409,8 +459,39 @@ class YagiCalculator:
                     f.write(f"- Driven to Director {i+1}: {self.format_length(spacing, parameters['units'])}\n")
                 
                 f.write(f"\nTotal Boom Length: {self.format_length(results['total_boom'], parameters['units'])}\n")
+                
+                f.write("\nMounting Points (from reflector end):\n")
+                for label, position in zip(results['geometry'].labels(), results['geometry'].mounting_points()):
+                    f.write(f"- {label}: {self.format_length(position, parameters['units'])}\n")
+                
+                f.write("\nFeedpoint Matching:\n")
+                for line in matching_summary(results, frequency, parameters['optimize_for'],
+                                             lambda m: self.format_length(m, parameters['units'])):
+                    f.write(f"- {line.lstrip('• ')}\n")
+                
+                f.write("\nMaterials & Temperature:\n")
+                for line in materials_summary(results, frequency,
+                                              lambda m: self.format_length(m, parameters['units']),
+                                              boom_material=parameters['boom_material'],
+                                              boom_diameter=self.BOOM_DIAMETER_MM / 1000):
+                    f.write(f"- {line}\n")
+            
+            nec_filename = filename[:-len('.txt')] + '.nec'
+            with open(nec_filename, 'w') as f:
+                f.write(results['geometry'].to_nec(frequency, results['wire_diameter'],
+                                                   comment=f"Yagi {frequency} MHz, {parameters['num_directors']} directors"))
+            
+            # Shop drawings use the same dimension text as the report
+            title = f"Yagi {frequency} MHz, {parameters['num_directors']} directors, {parameters['wire_gauge']} AWG"
+            drawing_base = filename[:-len('.txt')]
+            for extension, render in (('.svg', render_svg), ('.dxf', render_dxf)):
+                with open(drawing_base + extension, 'w') as f:
+                    f.write(render(results['geometry'], parameters['units'], title,
+                                   lambda m: self.format_length(m, parameters['units'])))
             
             print(f"\nResults saved to: {filename}")
+            print(f"NEC model saved to: {nec_filename}")
+            print(f"Drawings saved to: {drawing_base}.svg, {drawing_base}.dxf")
             
         except IOError as e:
             print(f"\nError saving file: {e}")
@@ -452,10 +533,66 @@ class YagiCalculator:
             print(f"\nAn error occurred: {e}")
             sys.exit(1)
 
-def main():
+def build_parser(calculator):
+    """Command-line parser for scripted use; argparse is only imported when arguments are given"""
+    import argparse
+    
+    parser = argparse.ArgumentParser(description="Advanced Yagi Antenna Calculator")
+    subparsers = parser.add_subparsers(dest='command')
+    subparsers.add_parser('interactive', help="run the interactive calculator (default)")
+    for name, help_text in (('calc', "print the design for the given parameters"),
+                            ('export', "save the results NEC model and SVG/DXF drawings")):
+        sub = subparsers.add_parser(name, help=help_text)
+        sub.add_argument('-f', '--frequency', type=float, required=True, help="frequency in MHz")
+        sub.add_argument('-d', '--directors', type=int, default=3, choices=range(21), metavar='{0-20}',
+                         help="number of directors")
+        sub.add_argument('-g', '--gauge', default='14', choices=list(calculator.WIRE_GAUGES),
+                         help="wire gauge (AWG)")
+        sub.add_argument('-m', '--material', default='aluminum', choices=list(calculator.BOOM_CORRECTIONS),
+                         help="boom material")
+        sub.add_argument('-o', '--optimize', default='balanced', choices=['gain', 'bandwidth', 'f2b', 'balanced'],
+                         help="optimization target")
+        sub.add_argument('-u', '--units', default='metric', choices=['metric', 'imperial'])
+        if name == 'calc':
+            sub.add_argument('--json', action='store_true', help="print the results as JSON")
+    return parser
+
+def main(argv=None):
     """Entry point"""
+    if argv is None:
+        argv = sys.argv[1:]
     calculator = YagiCalculator()
-    calculator.run()
+    if not argv:
+        calculator.run()
+        return
+    
+    parser = build_parser(calculator)
+    args = parser.parse_args(argv)
+    if args.command in (None, 'interactive'):
+        calculator.run()
+        return
+    if args.frequency <= 0:
+        parser.error("frequency must be positive")
+    
+    parameters = {
+        'num_directors': args.directors,
+        'wire_gauge': args.gauge,
+        'boom_material': args.material,
+        'optimize_for': args.optimize,
+        'units': args.units
+    }
+    results = calculator.calculate_yagi(args.frequency, parameters)
+    
+    if args.command == 'export':
+        calculator.save_results(args.frequency, parameters, results)
+    elif args.json:
+        import json
+        
+        output = {key: value for key, value in results.items() if key != 'geometry'}
+        output['element_positions'] = list(results['geometry'].positions)
+        print(json.dumps({'frequency': args.frequency, 'parameters': parameters, 'results': output}))
+    else:
+        calculator.display_results(args.frequency, parameters, results)
 
 if __name__ == "__main__":
     main()
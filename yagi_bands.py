@@ -0,0 +1,193 @@
+#!/usr/bin/env python3
+"""
+Amateur Band Plan Catalog
+ITU-region allocations and sub-band segments with interval-indexed frequency lookup
+"""
+
+import marshal
+import os
+from array import array
+from bisect import bisect_right
+from typing import Iterator, List, Optional, Sequence, Tuple
+
+DEFAULT_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'yagi_bandplan.json')
+DEFAULT_REGION = 2
+REGIONS = (1, 2, 3)
+SWEEP_POINTS = ('segment_centers', 'band_centers', 'edges')
+
+# Bumped whenever the preparsed layout changes so stale caches are ignored
+_CACHE_FORMAT = 1
+
+
+class Band:
+    """One amateur allocation in one ITU region."""
+
+    __slots__ = ('name', 'region', 'low', 'high', 'segments')
+
+    def __init__(self, name: str, region: int, low: float, high: float,
+                 segments: Sequence[Tuple[float, float, str]]):
+        self.name = name
+        self.region = region
+        self.low = low
+        self.high = high
+        self.segments = tuple(tuple(segment) for segment in segments)
+
+    @property
+    def center(self) -> float:
+        return (self.low + self.high) / 2
+
+    def segment_at(self, frequency: float) -> Optional[Tuple[float, float, str]]:
+        """Return the (low, high, mode) segment containing the frequency, if any."""
+        for segment in self.segments:
+            if segment[0] <= frequency <= segment[1]:
+                return segment
+        return None
+
+    def __repr__(self):
+        return f"Band({self.name!r}, region={self.region}, {self.low}-{self.high} MHz)"
+
+
+class BandPlan:
+    """Band catalog with a sorted interval index per region."""
+
+    def __init__(self, allocations: Sequence[Tuple]):
+        self._bands = {}
+        self._lows = {}
+        self._highs = {}
+        for name, region, low, high, segments in allocations:
+            self._bands.setdefault(region, []).append(Band(name, region, low, high, segments))
+        for region, bands in self._bands.items():
+            bands.sort(key=lambda band: band.low)
+            self._lows[region] = array('d', (band.low for band in bands))
+            self._highs[region] = array('d', (band.high for band in bands))
+
+    def regions(self) -> List[int]:
+        return sorted(self._bands)
+
+    def bands(self, region: int = DEFAULT_REGION) -> List[Band]:
+        """All allocations of a region, lowest frequency first."""
+        return list(self._bands.get(region, ()))
+
+    def band(self, name: str, region: int = DEFAULT_REGION) -> Optional[Band]:
+        """Look up an allocation by its band name, e.g. '2m'."""
+        for band in self._bands.get(region, ()):
+            if band.name == name:
+                return band
+        return None
+
+    def lookup(self, frequency: float, region: int = DEFAULT_REGION) -> Optional[Band]:
+        """Band containing the frequency in MHz, or None outside the amateur allocations."""
+        lows = self._lows.get(region)
+        if lows is None:
+            return None
+        i = bisect_right(lows, frequency) - 1
+        if i >= 0 and frequency <= self._highs[region][i]:
+            return self._bands[region][i]
+        return None
+
+    def lookup_segment(self, frequency: float,
+                       region: int = DEFAULT_REGION) -> Tuple[Optional[Band], Optional[Tuple[float, float, str]]]:
+        """Band and sub-band segment containing the frequency."""
+        band = self.lookup(frequency, region)
+        if band is None:
+            return None, None
+        return band, band.segment_at(frequency)
+
+    def lookup_batch(self, frequencies: Sequence[float], region: int = DEFAULT_REGION) -> List[Optional[Band]]:
+        """Bands for many frequencies; sorted input is resolved with a single merge pass."""
+        if any(frequencies[i] > frequencies[i + 1] for i in range(len(frequencies) - 1)):
+            return [self.lookup(f, region) for f in frequencies]
+        bands = self._bands.get(region, [])
+        highs = self._highs.get(region, array('d'))
+        lows = self._lows.get(region, array('d'))
+        out = []
+        i = 0
+        for f in frequencies:
+            while i < len(bands) and highs[i] < f:
+                i += 1
+            out.append(bands[i] if i < len(bands) and lows[i] <= f else None)
+        return out
+
+    def sweep_frequencies(self, region: int = DEFAULT_REGION, band_names: Optional[Sequence[str]] = None,
+                          points: str = 'segment_centers') -> Iterator[Tuple[str, str, float]]:
+        """Expand bands into (band, label, frequency) sweep inputs.
+
+        ``points`` is one of SWEEP_POINTS: 'segment_centers', 'band_centers' or 'edges'.
+        """
+        for band in self._bands.get(region, ()):
+            if band_names is not None and band.name not in band_names:
+                continue
+            if points == 'segment_centers':
+                for low, high, mode in band.segments:
+                    yield band.name, mode, (low + high) / 2
+            elif points == 'band_centers':
+                yield band.name, 'center', band.center
+            elif points == 'edges':
+                yield band.name, 'low', band.low
+                yield band.name, 'center', band.center
+                yield band.name, 'high', band.high
+            else:
+                raise ValueError(f"Unknown sweep points: {points}")
+
+
+def _parse(path: str) -> List[Tuple]:
+    """Read the JSON catalog into plain tuples suitable for marshal."""
+    import json  # not needed when the preparsed cache is valid
+
+    with open(path) as f:
+        document = json.load(f)
+    return [(entry['band'], int(entry['region']), float(entry['low']), float(entry['high']),
+             tuple((float(low), float(high), mode) for low, high, mode in entry['segments']))
+            for entry in document['allocations']]
+
+
+def _cache_path(path: str) -> str:
+    directory, name = os.path.split(path)
+    return os.path.join(directory, '__pycache__', name + '.marshal')
+
+
+def load_band_plan(path: str = DEFAULT_PATH, use_cache: bool = True) -> BandPlan:
+    """Load a catalog, reusing the preparsed binary copy when the JSON is unchanged."""
+    key = None
+    if use_cache:
+        stat = os.stat(path)
+        key = (_CACHE_FORMAT, stat.st_mtime_ns, stat.st_size)
+        try:
+            with open(_cache_path(path), 'rb') as f:
+                cached_key, allocations = marshal.loads(f.read())
+            if tuple(cached_key) == key:
+                return BandPlan(allocations)
+        except (OSError, EOFError, ValueError, TypeError):
+            pass
+
+    allocations = _parse(path)
+    if use_cache:
+        try:
+            os.makedirs(os.path.dirname(_cache_path(path)), exist_ok=True)
+            with open(_cache_path(path), 'wb') as f:
+                f.write(marshal.dumps((key, allocations)))
+        except OSError:
+            pass  # read-only install; parse every time
+    return BandPlan(allocations)
+
+
+_default_plan = None
+
+
+def default_band_plan() -> BandPlan:
+    """The bundled catalog, loaded once per process."""
+    global _default_plan
+    if _default_plan is None:
+        _default_plan = load_band_plan()
+    return _default_plan
+
+
+def describe_frequency(frequency: float, region: int = DEFAULT_REGION) -> str:
+    """Short text naming the band and segment a frequency falls in."""
+    band, segment = default_band_plan().lookup_segment(frequency, region)
+    if band is None:
+        return f"{frequency} MHz is outside the amateur allocations for ITU Region {region}"
+    if segment is None:
+        return f"{frequency} MHz is in the {band.name} band (Region {region})"
+    return f"{frequency} MHz is in the {band.name} band, {segment[2]} segment (Region {region})"
+
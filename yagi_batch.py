@@ -0,0 +1,233 @@
+#!/usr/bin/env python3
+"""
+Yagi Batch Evaluation
+Fixed-width numeric records for design specs and results, evaluated with the reference calculators
+"""
+
+import importlib.util
+import math
+import os
+from array import array
+from functools import lru_cache
+from typing import Dict, Iterable, List, Sequence
+
+from yagi_advanced_calculator import YagiCalculator
+from yagi_materials import REFERENCE_TEMPERATURE, TABLE_MAX, TABLE_MIN, resistance_per_meter, resonance_shift
+
+MAX_DIRECTORS = 20
+
+# Categorical fields are stored as their index in these tuples
+WIRE_GAUGES = ('10', '12', '14', '16', '18', '20', '22')
+BOOM_MATERIALS = ('wood', 'aluminum', 'fiberglass', 'pvc', 'carbon_fiber')
+OPTIMIZE_FOR = ('gain', 'bandwidth', 'f2b', 'balanced')
+CALCULATORS = ('advanced', 'non_isolated')
+ELEMENT_CONDUCTORS = ('copper', 'aluminum_1100', 'aluminum_6061', 'aluminum_6063', 'steel', 'stainless_304')
+
+# Boom materials and optimization modes each calculator models; the non-isolated
+# calculator is built around a conductive aluminum boom and has no balanced mode
+CALCULATOR_OPTIONS = {
+    'advanced': (BOOM_MATERIALS, OPTIMIZE_FOR),
+    'non_isolated': (('aluminum',), ('gain', 'bandwidth', 'f2b'))
+}
+
+SPEC_FIELDS = ('frequency', 'num_directors', 'wire_gauge', 'boom_material',
+               'optimize_for', 'boom_diameter_mm', 'calculator', 'conductor', 'temperature')
+# Conductor loss and the resonance of the element set, both at the spec's
+# temperature, follow the calculator fields; they are NaN when the design has
+# no physical elements to model
+SCALAR_RESULT_FIELDS = ('wavelength', 'reflector_length', 'driven_length', 'reflector_spacing',
+                        'total_boom', 'gain', 'front_to_back', 'beamwidth', 'input_impedance',
+                        'wire_diameter', 'conductor_loss_db', 'resonant_frequency')
+SPEC_WIDTH = len(SPEC_FIELDS)
+RESULT_WIDTH = len(SCALAR_RESULT_FIELDS) + 2 * MAX_DIRECTORS
+
+_NON_ISOLATED_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'yagi-non-isolated.py')
+_non_isolated_module = None
+_advanced = None
+_non_isolated = None
+
+
+def load_non_isolated():
+    """Import yagi-non-isolated.py, whose file name is not a valid module name."""
+    global _non_isolated_module
+    if _non_isolated_module is None:
+        spec = importlib.util.spec_from_file_location('yagi_non_isolated', _NON_ISOLATED_PATH)
+        module = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(module)
+        _non_isolated_module = module
+    return _non_isolated_module
+
+
+def make_spec(frequency: float, num_directors: int = 3, wire_gauge: str = '14',
+              boom_material: str = 'aluminum', optimize_for: str = 'gain',
+              boom_diameter_mm: float = 25.0, calculator: str = 'advanced', conductor: str = 'copper',
+              temperature: float = REFERENCE_TEMPERATURE) -> Dict:
+    """Build a design spec dict with the calculators' defaults."""
+    return {
+        'frequency': frequency,
+        'num_directors': num_directors,
+        'wire_gauge': wire_gauge,
+        'boom_material': boom_material,
+        'optimize_for': optimize_for,
+        'boom_diameter_mm': boom_diameter_mm,
+        'calculator': calculator,
+        'conductor': conductor,
+        'temperature': temperature
+    }
+
+
+def supports(calculator: str, boom_material: str, optimize_for: str) -> bool:
+    """Whether a calculator models this boom material and optimization mode."""
+    materials, modes = CALCULATOR_OPTIONS[calculator]
+    return boom_material in materials and optimize_for in modes
+
+
+def validate_spec(spec: Dict):
+    """Raise ValueError for a spec the batch layout or its calculator cannot represent."""
+    calculator = spec.get('calculator', 'advanced')
+    if calculator not in CALCULATOR_OPTIONS:
+        raise ValueError(f"Unknown calculator: {calculator}")
+    if not 0 <= spec['num_directors'] <= MAX_DIRECTORS:
+        raise ValueError(f"Number of directors must be 0-{MAX_DIRECTORS}")
+    if spec.get('conductor', 'copper') not in ELEMENT_CONDUCTORS:
+        raise ValueError(f"Conductor must be one of {', '.join(ELEMENT_CONDUCTORS)}")
+    if not TABLE_MIN <= spec.get('temperature', REFERENCE_TEMPERATURE) <= TABLE_MAX:
+        raise ValueError(f"Temperature must be within {TABLE_MIN:.0f}..{TABLE_MAX:.0f} °C")
+    material = spec.get('boom_material', 'aluminum')
+    if not supports(calculator, material, spec['optimize_for']):
+        materials, modes = CALCULATOR_OPTIONS[calculator]
+        raise ValueError(f"The {calculator.replace('_', '-')} calculator supports boom materials "
+                         f"{', '.join(materials)} and optimization {', '.join(modes)}, "
+                         f"not {material}/{spec['optimize_for']}")
+
+
+def encode_spec(spec: Dict) -> List[float]:
+    """Pack a spec dict into one SPEC_WIDTH row."""
+    validate_spec(spec)
+    return [
+        float(spec['frequency']),
+        float(spec['num_directors']),
+        float(WIRE_GAUGES.index(spec['wire_gauge'])),
+        float(BOOM_MATERIALS.index(spec.get('boom_material', 'aluminum'))),
+        float(OPTIMIZE_FOR.index(spec['optimize_for'])),
+        float(spec.get('boom_diameter_mm', 25.0)),
+        float(CALCULATORS.index(spec.get('calculator', 'advanced'))),
+        float(ELEMENT_CONDUCTORS.index(spec.get('conductor', 'copper'))),
+        float(spec.get('temperature', REFERENCE_TEMPERATURE))
+    ]
+
+
+def decode_spec(row: Sequence[float]) -> Dict:
+    """Unpack one SPEC_WIDTH row into a spec dict."""
+    return make_spec(row[0], int(row[1]), WIRE_GAUGES[int(row[2])], BOOM_MATERIALS[int(row[3])],
+                     OPTIMIZE_FOR[int(row[4])], row[5], CALCULATORS[int(row[6])], ELEMENT_CONDUCTORS[int(row[7])],
+                     row[8])
+
+
+def encode_specs(specs: Iterable[Dict]) -> array:
+    """Pack many specs into one flat array of SPEC_WIDTH rows."""
+    rows = array('d')
+    for spec in specs:
+        rows.extend(encode_spec(spec))
+    return rows
+
+
+@lru_cache(maxsize=4096)
+def _conductor_terms(frequency: float, wire_diameter: float, conductor: str, temperature: float):
+    """Per-meter RF resistance and element resonance; sweeps repeat a few of these combinations."""
+    return (resistance_per_meter(frequency, wire_diameter, conductor, temperature),
+            resonance_shift(frequency, temperature, conductor))
+
+
+def material_results(results: Dict, spec: Dict) -> Dict:
+    """Conductor loss and resonant frequency of a calculated design at the spec's conductor and temperature.
+
+    Same model as yagi_materials.element_loss.
+    """
+    per_meter, resonant = _conductor_terms(spec['frequency'], results['wire_diameter'],
+                                           spec.get('conductor', 'copper'),
+                                           spec.get('temperature', REFERENCE_TEMPERATURE))
+    lengths = results['geometry'].lengths
+    radiation_resistance = results['input_impedance']
+    if len(lengths) and min(lengths) > 0 and radiation_resistance > 0:
+        loss = 10 * math.log10(1 + per_meter * sum(lengths) / 2 / radiation_resistance)
+    else:
+        loss = math.nan
+    return {
+        'conductor_loss_db': loss,
+        'resonant_frequency': resonant
+    }
+
+
+def evaluate(spec: Dict) -> Dict:
+    """Run the reference calculator named by the spec and return its results dict.
+
+    The dict also holds the material_results fields for the spec's conductor and temperature.
+    """
+    results = _calculate(spec)
+    results.update(material_results(results, spec))
+    return results
+
+
+def _calculate(spec: Dict) -> Dict:
+    global _advanced, _non_isolated
+    if spec.get('calculator', 'advanced') == 'non_isolated':
+        validate_spec(spec)
+        if _non_isolated is None:
+            _non_isolated = load_non_isolated().NonIsolatedYagiCalculator()
+        calculator = _non_isolated
+        calculator.frequency_mhz = spec['frequency']
+        calculator.num_directors = spec['num_directors']
+        calculator.wire_gauge = spec['wire_gauge']
+        calculator.boom_diameter_mm = spec.get('boom_diameter_mm', 25.0)
+        calculator.optimize_for = spec['optimize_for']
+        results = calculator.calculate_antenna()
+        if results is None:
+            raise ValueError("Frequency must be positive")
+        return results
+    if _advanced is None:
+        _advanced = YagiCalculator()
+    return _advanced.calculate_yagi(spec['frequency'], spec)
+
+
+def encode_result(results: Dict) -> List[float]:
+    """Pack a results dict into one RESULT_WIDTH row; unused director slots are zero."""
+    row = [float(results[field]) for field in SCALAR_RESULT_FIELDS]
+    padding = [0.0] * (MAX_DIRECTORS - len(results['director_lengths']))
+    row.extend(results['director_lengths'])
+    row.extend(padding)
+    row.extend(results['director_spacings'])
+    row.extend(padding)
+    if len(row) != RESULT_WIDTH:
+        raise ValueError(f"Result row has {len(row)} values, expected {RESULT_WIDTH}")
+    return row
+
+
+def decode_result(row: Sequence[float], num_directors: int) -> Dict:
+    """Unpack one RESULT_WIDTH row into a results dict without the geometry object."""
+    results = dict(zip(SCALAR_RESULT_FIELDS, row))
+    base = len(SCALAR_RESULT_FIELDS)
+    results['director_lengths'] = list(row[base:base + num_directors])
+    base += MAX_DIRECTORS
+    results['director_spacings'] = list(row[base:base + num_directors])
+    return results
+
+
+def evaluate_rows(specs: Sequence[float], out, count: int, spec_offset: int = 0, out_offset: int = 0):
+    """Evaluate ``count`` packed spec rows and write packed result rows into ``out``.
+
+    ``specs`` and ``out`` may be arrays or memoryviews of doubles, so this works
+    directly on shared memory.
+    """
+    for i in range(count):
+        s = spec_offset + i * SPEC_WIDTH
+        o = out_offset + i * RESULT_WIDTH
+        out[o:o + RESULT_WIDTH] = array('d', encode_result(evaluate(decode_spec(specs[s:s + SPEC_WIDTH]))))
+
+
+def evaluate_batch(specs: Sequence[float]) -> array:
+    """Evaluate a flat array of spec rows in this process."""
+    count = len(specs) // SPEC_WIDTH
+    out = array('d', bytes(8 * RESULT_WIDTH * count))
+    evaluate_rows(specs, out, count)
+    return out
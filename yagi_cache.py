@@ -0,0 +1,206 @@
+#!/usr/bin/env python3
+"""
+Sweep Result Cache and Run Manifests
+Per-chunk result caching keyed by input content and calculator code version
+"""
+
+import hashlib
+import os
+import time
+from array import array
+from collections import deque
+from typing import Dict, Iterable, Iterator, Optional, Sequence, Tuple
+
+from yagi_batch import RESULT_WIDTH, SCALAR_RESULT_FIELDS, SPEC_FIELDS, SPEC_WIDTH, evaluate_batch
+
+_ROOT = os.path.dirname(os.path.abspath(__file__))
+
+# Source files whose contents determine the numbers a sweep produces
+CODE_FILES = ('yagi_advanced_calculator.py', 'yagi-non-isolated.py', 'yagi_geometry.py', 'yagi_materials.py',
+              'yagi_batch.py')
+
+# Bumped whenever the on-disk chunk or manifest layout changes
+CACHE_FORMAT = 1
+MANIFEST_FORMAT = 1
+
+_code_version = None
+
+
+def code_files_digest() -> Dict[str, str]:
+    """SHA-256 of every calculation source file."""
+    digests = {}
+    for name in CODE_FILES:
+        with open(os.path.join(_ROOT, name), 'rb') as f:
+            digests[name] = hashlib.sha256(f.read()).hexdigest()
+    return digests
+
+
+def code_version() -> str:
+    """Single hash covering the calculation code and the packed record layout."""
+    global _code_version
+    if _code_version is None:
+        h = hashlib.sha256(f"{CACHE_FORMAT}|{SPEC_FIELDS}|{SCALAR_RESULT_FIELDS}|{RESULT_WIDTH}".encode())
+        for name, digest in sorted(code_files_digest().items()):
+            h.update(f"{name}={digest}".encode())
+        _code_version = h.hexdigest()
+    return _code_version
+
+
+class ChunkCache:
+    """Directory of packed result chunks, each named by the hash of its inputs and code version."""
+
+    def __init__(self, directory: str, version: Optional[str] = None):
+        self.directory = directory
+        self.version = version or code_version()
+        self.hits = 0
+        self.misses = 0
+
+    def key(self, specs: Sequence[float]) -> str:
+        """Content hash of a packed spec chunk under the current code version."""
+        h = hashlib.sha256(self.version.encode())
+        h.update(array('d', specs).tobytes())
+        return h.hexdigest()
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, key[:2], key + '.bin')
+
+    def load(self, key: str, rows: int) -> Optional[array]:
+        """Cached results for a key holding ``rows`` designs, or None if absent, unreadable or the wrong size."""
+        try:
+            with open(self._path(key), 'rb') as f:
+                data = f.read()
+        except OSError:
+            return None
+        if len(data) != 8 * RESULT_WIDTH * rows:
+            return None  # truncated or foreign file; recompute
+        results = array('d')
+        results.frombytes(data)
+        return results
+
+    def store(self, key: str, results: array):
+        """Write a chunk atomically so interrupted runs never leave partial entries."""
+        path = self._path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        temporary = f"{path}.{os.getpid()}.tmp"
+        with open(temporary, 'wb') as f:
+            f.write(array('d', results).tobytes())
+        os.replace(temporary, path)
+
+    def evaluate(self, specs: Sequence[float]) -> array:
+        """Cached results for a chunk, evaluating and storing them on a miss."""
+        key = self.key(specs)
+        results = self.load(key, len(specs) // SPEC_WIDTH)
+        if results is not None:
+            self.hits += 1
+            return results
+        self.misses += 1
+        results = evaluate_batch(specs)
+        self.store(key, results)
+        return results
+
+
+class RunManifest:
+    """Record of one sweep: its inputs, code version and a hash per chunk."""
+
+    def __init__(self, spec: Dict, chunk_size: int, version: Optional[str] = None):
+        self.spec = spec
+        self.chunk_size = chunk_size
+        self.version = version or code_version()
+        self.chunks = []
+        self.started = time.time()
+
+    def add(self, key: str, specs: Sequence[float], results: Sequence[float], cached: bool):
+        self.chunks.append({
+            'index': len(self.chunks),
+            'rows': len(specs) // SPEC_WIDTH,
+            'input_hash': key,
+            'output_hash': hashlib.sha256(array('d', results).tobytes()).hexdigest(),
+            'cached': cached
+        })
+
+    def to_dict(self) -> Dict:
+        hits = sum(1 for chunk in self.chunks if chunk['cached'])
+        return {
+            'format': MANIFEST_FORMAT,
+            'created': time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime(self.started)),
+            'elapsed': time.time() - self.started,
+            'spec': self.spec,
+            'chunk_size': self.chunk_size,
+            'code_version': self.version,
+            'code_files': code_files_digest(),
+            'designs': sum(chunk['rows'] for chunk in self.chunks),
+            'chunks_cached': hits,
+            'chunks_computed': len(self.chunks) - hits,
+            'chunks': self.chunks
+        }
+
+    def save(self, path: str):
+        import json
+
+        temporary = path + '.tmp'
+        with open(temporary, 'w') as f:
+            json.dump(self.to_dict(), f, indent=1)
+        os.replace(temporary, path)
+
+
+def load_manifest(path: str) -> Dict:
+    """Read a manifest written by RunManifest.save."""
+    import json
+
+    with open(path) as f:
+        manifest = json.load(f)
+    if manifest.get('format') != MANIFEST_FORMAT:
+        raise ValueError("Unsupported manifest format")
+    return manifest
+
+
+def evaluate_cached(spec_chunks: Iterable[array], cache: ChunkCache, pool=None,
+                    manifest: Optional[RunManifest] = None) -> Iterator[Tuple[array, array]]:
+    """Like yagi_stream.evaluate_chunks, but only chunks missing from the cache are computed.
+
+    With a pool, chunks are handled in windows of ``2 * pool.slots``: cached chunks are
+    read straight from disk and the misses of the window are spread over the workers.
+    """
+    def record(key, specs, results, cached):
+        if manifest is not None:
+            manifest.add(key, specs, results, cached)
+
+    if pool is None:
+        for specs in spec_chunks:
+            key = cache.key(specs)
+            results = cache.load(key, len(specs) // SPEC_WIDTH)
+            cached = results is not None
+            if cached:
+                cache.hits += 1
+            else:
+                cache.misses += 1
+                results = evaluate_batch(specs)
+                cache.store(key, results)
+            record(key, specs, results, cached)
+            yield specs, results
+        return
+
+    source = iter(spec_chunks)
+    window = 2 * pool.slots
+    while True:
+        entries = deque()
+        for specs in source:
+            key = cache.key(specs)
+            entries.append((specs, key, cache.load(key, len(specs) // SPEC_WIDTH)))
+            if len(entries) == window:
+                break
+        if not entries:
+            return
+        computed = iter(pool.imap_chunks([specs for specs, _, results in entries if results is None]))
+        for specs, key, results in entries:
+            cached = results is not None
+            if cached:
+                cache.hits += 1
+            else:
+                cache.misses += 1
+                results = next(computed)
+                cache.store(key, results)
+            record(key, specs, results, cached)
+            yield specs, results
+        for _ in computed:
+            pass  # let the pool generator finish and release its slots
@@ -0,0 +1,238 @@
+#!/usr/bin/env python3
+"""
+Shop Drawing Export
+Dimensioned SVG and DXF drawings of element layouts, streamed in bulk into zip archives
+"""
+
+import sys
+import zipfile
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from yagi_geometry import ElementGeometry
+
+FORMATS = ('svg', 'dxf')
+
+# SVG layout in pixels
+SVG_WIDTH = 1000
+SVG_ELEMENT_HEIGHT = 560
+SVG_MARGIN = 60
+SVG_LABEL_SPACE = 110
+SVG_DIMENSION_SPACE = 110
+
+# DXF drawing units per meter; R12 has no $INSUNITS, so the unit is documented rather than declared
+DXF_UNITS = {
+    'metric': 1000.0,  # millimeters
+    'imperial': 39.3701  # inches
+}
+
+INCHES_PER_METER = 39.3701
+
+
+def format_dimension(meters: float, units: str = 'metric') -> str:
+    """Shop-drawing dimension text: millimeters, or inches / feet-inches."""
+    if units == 'metric':
+        mm = meters * 1000
+        return f"{mm:.1f} mm" if mm < 100 else f"{mm:.0f} mm"
+    inches = meters * INCHES_PER_METER
+    if inches < 12:
+        return f'{inches:.2f}"'
+    return f"{int(inches // 12)}' {inches % 12:.2f}\""
+
+
+def _escape(text: str) -> str:
+    return text.replace('&', '&amp;').replace('<', '&lt;').replace('>', '&gt;')
+
+
+def render_svg(geometry: ElementGeometry, units: str = 'metric', title: str = "",
+               format_length: Optional[Callable[[float], str]] = None) -> str:
+    """Top view of the boom and elements with element lengths and chained spacing dimensions."""
+    fmt = format_length or (lambda m: format_dimension(m, units))
+    count = len(geometry)
+    origin = min(geometry.positions) if count else 0.0
+    boom = geometry.boom_length
+    longest = max(geometry.lengths) if count else 0.0
+    scale = min((SVG_WIDTH - 2 * SVG_MARGIN) / boom if boom else float('inf'),
+                SVG_ELEMENT_HEIGHT / longest if longest else float('inf'))
+    if scale == float('inf'):
+        scale = 1.0
+    width = max(boom * scale + 2 * SVG_MARGIN, 2 * SVG_MARGIN + 200)
+    center_y = SVG_LABEL_SPACE + longest * scale / 2
+    dimension_y = center_y + longest * scale / 2 + 30
+    height = dimension_y + SVG_DIMENSION_SPACE
+    xs = [SVG_MARGIN + (x - origin) * scale for x in geometry.positions]
+
+    out = [
+        f'<svg xmlns="http://www.w3.org/2000/svg" width="{width:.0f}" height="{height:.0f}" '
+        f'viewBox="0 0 {width:.1f} {height:.1f}" font-family="sans-serif" font-size="11">',
+        '<rect width="100%" height="100%" fill="white"/>',
+        f'<line x1="{SVG_MARGIN - 10:.1f}" y1="{center_y:.1f}" x2="{SVG_MARGIN + boom * scale + 10:.1f}" '
+        f'y2="{center_y:.1f}" stroke="#777" stroke-width="6"/>'
+    ]
+    for x, length, label in zip(xs, geometry.lengths, geometry.labels()):
+        half = length * scale / 2
+        top = center_y - half
+        bottom = center_y + half
+        out.append(f'<line x1="{x:.1f}" y1="{top:.1f}" x2="{x:.1f}" y2="{bottom:.1f}" stroke="black" stroke-width="2"/>')
+        out.append(f'<text x="{x:.1f}" y="{top - 6:.1f}" transform="rotate(-90 {x:.1f} {top - 6:.1f})">'
+                   f'{_escape(label)}</text>')
+        out.append(f'<text x="{x + 4:.1f}" y="{bottom:.1f}" transform="rotate(-90 {x + 4:.1f} {bottom:.1f})" '
+                   f'dy="10" fill="#036">{_escape(fmt(length))}</text>')
+        # Extension line down to the spacing dimensions
+        out.append(f'<line x1="{x:.1f}" y1="{bottom + 4:.1f}" x2="{x:.1f}" y2="{dimension_y + 34:.1f}" '
+                   f'stroke="#999" stroke-width="0.5" stroke-dasharray="3,3"/>')
+
+    def dimension(x1, x2, y, text):
+        out.append(f'<line x1="{x1:.1f}" y1="{y:.1f}" x2="{x2:.1f}" y2="{y:.1f}" stroke="#036"/>')
+        for x in (x1, x2):
+            out.append(f'<line x1="{x - 4:.1f}" y1="{y + 4:.1f}" x2="{x + 4:.1f}" y2="{y - 4:.1f}" stroke="#036"/>')
+        out.append(f'<text x="{(x1 + x2) / 2:.1f}" y="{y - 4:.1f}" text-anchor="middle" fill="#036">'
+                   f'{_escape(text)}</text>')
+
+    order = sorted(range(count), key=lambda i: geometry.positions[i])
+    for a, b in zip(order, order[1:]):
+        dimension(xs[a], xs[b], dimension_y, fmt(geometry.positions[b] - geometry.positions[a]))
+    if count > 1:
+        dimension(xs[order[0]], xs[order[-1]], dimension_y + 30, f"Boom {fmt(boom)}")
+    if title:
+        out.append(f'<text x="{SVG_MARGIN:.1f}" y="{height - 16:.1f}" font-size="14">{_escape(title)}</text>')
+    out.append('</svg>\n')
+    return '\n'.join(out)
+
+
+def _dxf_line(out: List[str], layer: str, x1: float, y1: float, x2: float, y2: float):
+    out.append(f"0\nLINE\n8\n{layer}\n10\n{x1:.4f}\n20\n{y1:.4f}\n30\n0.0\n11\n{x2:.4f}\n21\n{y2:.4f}\n31\n0.0")
+
+
+def _dxf_text(out: List[str], layer: str, x: float, y: float, height: float, text: str,
+              rotation: float = 0.0, centered: bool = False):
+    entry = f"0\nTEXT\n8\n{layer}\n10\n{x:.4f}\n20\n{y:.4f}\n30\n0.0\n40\n{height:.4f}\n1\n{text}\n50\n{rotation:.1f}"
+    if centered:
+        entry += f"\n72\n1\n11\n{x:.4f}\n21\n{y:.4f}\n31\n0.0"
+    out.append(entry)
+
+
+def render_dxf(geometry: ElementGeometry, units: str = 'metric', title: str = "",
+               format_length: Optional[Callable[[float], str]] = None) -> str:
+    """Full-scale ASCII DXF (R12) with the boom along X and elements along Y.
+
+    Drawing units are millimeters for metric and inches for imperial. Layers are
+    BOOM, ELEMENTS, DIMENSIONS and TEXT.
+    """
+    fmt = format_length or (lambda m: format_dimension(m, units))
+    per_meter = DXF_UNITS[units]
+    count = len(geometry)
+    origin = min(geometry.positions) if count else 0.0
+    boom = geometry.boom_length * per_meter
+    longest = (max(geometry.lengths) if count else 0.0) * per_meter
+    text_height = max(boom, longest, 1.0) * 0.012
+    xs = [(x - origin) * per_meter for x in geometry.positions]
+
+    out = ["0\nSECTION\n2\nHEADER\n9\n$ACADVER\n1\nAC1009",
+           "0\nENDSEC\n0\nSECTION\n2\nENTITIES"]
+    _dxf_line(out, 'BOOM', -text_height, 0.0, boom + text_height, 0.0)
+    for x, length, label in zip(xs, geometry.lengths, geometry.labels()):
+        half = length * per_meter / 2
+        _dxf_line(out, 'ELEMENTS', x, -half, x, half)
+        _dxf_text(out, 'TEXT', x - text_height / 2, half + text_height, text_height, label, 90.0)
+        _dxf_text(out, 'DIMENSIONS', x + text_height * 1.5, -half, text_height, fmt(length), 90.0)
+
+    dimension_y = -longest / 2 - 4 * text_height
+    order = sorted(range(count), key=lambda i: xs[i])
+    for a, b in zip(order, order[1:]):
+        _dxf_line(out, 'DIMENSIONS', xs[a], dimension_y, xs[b], dimension_y)
+        _dxf_text(out, 'DIMENSIONS', (xs[a] + xs[b]) / 2, dimension_y + text_height * 0.5, text_height,
+                  fmt(geometry.positions[b] - geometry.positions[a]), centered=True)
+    for x in xs:
+        _dxf_line(out, 'DIMENSIONS', x, dimension_y - text_height, x, dimension_y + text_height)
+    if count > 1:
+        overall_y = dimension_y - 3 * text_height
+        _dxf_line(out, 'DIMENSIONS', 0.0, overall_y, boom, overall_y)
+        _dxf_text(out, 'DIMENSIONS', boom / 2, overall_y + text_height * 0.5, text_height,
+                  f"Boom {fmt(geometry.boom_length)}", centered=True)
+    if title:
+        _dxf_text(out, 'TEXT', 0.0, dimension_y - 7 * text_height, text_height * 1.5, title)
+    out.append("0\nENDSEC\n0\nEOF\n")
+    return '\n'.join(out)
+
+
+RENDERERS = {'svg': render_svg, 'dxf': render_dxf}
+
+
+def geometry_from_record(record: Dict) -> ElementGeometry:
+    """Rebuild a Yagi layout from a batch or stream results record."""
+    return ElementGeometry.from_yagi(record['reflector_length'], record['driven_length'],
+                                     record['director_lengths'], record['reflector_spacing'],
+                                     record['director_spacings'])
+
+
+def write_archive(drawings: Iterable[Tuple[str, ElementGeometry, str]], path: str, units: str = 'metric',
+                  formats: Iterable[str] = FORMATS, compression: int = zipfile.ZIP_DEFLATED) -> int:
+    """Render (name, geometry, title) items into a zip archive one at a time.
+
+    Each drawing is written and released before the next is rendered, so memory
+    stays flat however many drawings the iterable produces. Returns the number of
+    layouts drawn.
+    """
+    formats = tuple(formats)
+    for fmt in formats:
+        if fmt not in RENDERERS:
+            raise ValueError(f"Unknown drawing format: {fmt}")
+    count = 0
+    with zipfile.ZipFile(path, 'w', compression) as archive:
+        for name, geometry, title in drawings:
+            for fmt in formats:
+                archive.writestr(f"{name}.{fmt}", RENDERERS[fmt](geometry, units, title))
+            count += 1
+    return count
+
+
+def record_drawings(records: Iterable[Dict]) -> Iterator[Tuple[str, ElementGeometry, str]]:
+    """(name, geometry, title) items for stream records, named after their design parameters."""
+    for i, record in enumerate(records):
+        name = (f"{i:07d}_{record['frequency']:g}MHz_{record['num_directors']}dir_"
+                f"{record['wire_gauge']}awg_{record['boom_material']}_{record['optimize_for']}")
+        title = (f"Yagi {record['frequency']:g} MHz, {record['num_directors']} directors, "
+                 f"{record['wire_gauge']} AWG, {record['boom_material'].replace('_', ' ')} boom, "
+                 f"{record['optimize_for']} ({record['calculator'].replace('_', '-')})")
+        yield name, geometry_from_record(record), title
+
+
+def main(argv=None):
+    """Sweep a design grid and write shop drawings for every design into a zip archive."""
+    import argparse
+
+    from yagi_batch import BOOM_MATERIALS, MAX_DIRECTORS, OPTIMIZE_FOR, WIRE_GAUGES
+    from yagi_stream import evaluate_chunks, filter_chunks, pack, records, spec_grid
+
+    parser = argparse.ArgumentParser(description="Write SVG/DXF shop drawings for a design sweep")
+    parser.add_argument('-f', '--frequencies', required=True, help="comma-separated frequencies in MHz")
+    parser.add_argument('-d', '--directors', default='0-10', help="director count range, e.g. 0-10")
+    parser.add_argument('-g', '--gauges', default=','.join(WIRE_GAUGES))
+    parser.add_argument('-m', '--materials', default=','.join(BOOM_MATERIALS))
+    parser.add_argument('-o', '--optimize', default=','.join(OPTIMIZE_FOR))
+    parser.add_argument('-c', '--calculators', default='advanced')
+    parser.add_argument('-u', '--units', choices=tuple(DXF_UNITS), default='metric')
+    parser.add_argument('--formats', default=','.join(FORMATS))
+    parser.add_argument('--max-boom', type=float, help="only draw designs up to this boom length in meters")
+    parser.add_argument('--output', default='drawings.zip')
+    args = parser.parse_args(argv)
+
+    low, _, high = args.directors.partition('-')
+    directors = range(int(low), int(high or low) + 1)
+    if not directors or directors[0] < 0 or directors[-1] > MAX_DIRECTORS:
+        parser.error(f"director range must be within 0-{MAX_DIRECTORS}")
+    specs = spec_grid([float(f) for f in args.frequencies.split(',')], directors,
+                      args.gauges.split(','), args.materials.split(','), args.optimize.split(','),
+                      (25.0,), args.calculators.split(','))
+    chunks = filter_chunks(evaluate_chunks(pack(specs)), max_boom=args.max_boom)
+    try:
+        count = write_archive(record_drawings(records(chunks)), args.output, args.units,
+                              args.formats.split(','))
+    except ValueError as e:
+        print(f"Error: {e}")
+        sys.exit(1)
+    print(f"{count} drawings written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,177 @@
+#!/usr/bin/env python3
+"""
+Yagi Element Geometry
+Absolute element positions and lengths stored in contiguous arrays
+"""
+
+from array import array
+
+# Annotations use builtin types only: importing typing would dominate the
+# start-up time of the command-line calculators
+
+# Element kinds, in the order they appear along the boom of a Yagi
+REFLECTOR = 'reflector'
+DRIVEN = 'driven'
+DIRECTOR = 'director'
+LOG_PERIODIC = 'log_periodic'  # LPDA element, fed through the crossed feeder line
+
+
+class ElementGeometry:
+    """Element layout of one antenna, measured from the rearmost element."""
+
+    def __init__(self, positions, lengths, kinds=None):
+        self.positions = array('d', positions)
+        self.lengths = array('d', lengths)
+        if len(self.positions) != len(self.lengths):
+            raise ValueError("positions and lengths must have the same number of elements")
+        if kinds is None:
+            kinds = [DIRECTOR] * len(self.positions)
+        if len(kinds) != len(self.positions):
+            raise ValueError("kinds must have one entry per element")
+        self.kinds = tuple(kinds)
+
+    @classmethod
+    def from_yagi(cls, reflector_length: float, driven_length: float,
+                  director_lengths, reflector_spacing: float, director_spacings) -> 'ElementGeometry':
+        """Build the layout from calculator output (director spacings are measured from the driven element)."""
+        positions = array('d', [0.0, reflector_spacing])
+        positions.extend(reflector_spacing + spacing for spacing in director_spacings)
+        lengths = array('d', [reflector_length, driven_length])
+        lengths.extend(director_lengths)
+        kinds = [REFLECTOR, DRIVEN] + [DIRECTOR] * len(director_lengths)
+        return cls(positions, lengths, kinds)
+
+    def __len__(self) -> int:
+        return len(self.positions)
+
+    def index_of(self, kind: str) -> int:
+        """Return the index of the first element of the given kind."""
+        try:
+            return self.kinds.index(kind)
+        except ValueError:
+            raise ValueError(f"No {kind} element in this geometry") from None
+
+    def labels(self) -> list:
+        """Human-readable element names, numbering directors from the driven element forward."""
+        names = []
+        directors = 0
+        cells = 0
+        for kind in self.kinds:
+            if kind == DIRECTOR:
+                directors += 1
+                names.append(f"Director {directors}")
+            elif kind == LOG_PERIODIC:
+                cells += 1
+                names.append(f"LPDA Element {cells}")
+            else:
+                names.append(kind.title())
+        return names
+
+    @property
+    def boom_length(self) -> float:
+        """Distance between the first and last element."""
+        if not self.positions:
+            return 0.0
+        return max(self.positions) - min(self.positions)
+
+    def spacings(self) -> array:
+        """Center-to-center distance between neighbouring elements."""
+        p = self.positions
+        return array('d', (p[i + 1] - p[i] for i in range(len(p) - 1)))
+
+    def offsets_from(self, index: int) -> array:
+        """Distance of every element after ``index`` from the element at ``index``."""
+        origin = self.positions[index]
+        return array('d', (pos - origin for pos in self.positions[index + 1:]))
+
+    def director_spacings(self) -> list:
+        """Driven-to-director distances, as shown in the calculator output."""
+        return list(self.offsets_from(self.index_of(DRIVEN)))
+
+    def mounting_points(self, overhang: float = 0.0) -> array:
+        """Element positions measured from the rear boom end, given the boom overhang at each end."""
+        start = min(self.positions) if self.positions else 0.0
+        return array('d', (pos - start + overhang for pos in self.positions))
+
+    def endpoints(self) -> list:
+        """Return (x, y_left, y_right) for each element, with the boom along the x axis."""
+        return [(x, -length / 2, length / 2) for x, length in zip(self.positions, self.lengths)]
+
+    def to_nec(self, frequency: float, wire_diameter: float, segments: int = 21,
+               comment: str = "Yagi antenna", feeder_impedance: float = 0.0) -> str:
+        """Render the layout as a free-space NEC-2 deck.
+
+        Yagis are fed at the driven element center. Log-periodic elements are joined by
+        a crossed transmission line of ``feeder_impedance`` ohms and fed at the shortest one.
+        """
+        if segments % 2 == 0:
+            segments += 1  # odd count so the feed segment sits on the element center
+        center = segments // 2 + 1
+        radius = wire_diameter / 2
+        lines = [f"CM {comment}", "CE"]
+        for tag, (x, y1, y2) in enumerate(self.endpoints(), start=1):
+            lines.append(f"GW {tag} {segments} {x:.6f} {y1:.6f} 0 {x:.6f} {y2:.6f} 0 {radius:.6f}")
+        lines.append("GE 0")
+        cells = [i for i, kind in enumerate(self.kinds) if kind == LOG_PERIODIC]
+        if cells:
+            # A negative impedance tells NEC to cross the line between neighbouring elements
+            for a, b in zip(cells, cells[1:]):
+                lines.append(f"TL {a + 1} {center} {b + 1} {center} {-feeder_impedance:.1f} 0 0 0 0 0")
+            feed_tag = min(cells, key=lambda i: self.lengths[i]) + 1
+        else:
+            feed_tag = self.index_of(DRIVEN) + 1 if DRIVEN in self.kinds else 1
+        lines.append(f"EX 0 {feed_tag} {center} 0 1 0")
+        lines.append(f"FR 0 1 0 0 {frequency:.6f} 0")
+        lines.append("RP 0 1 360 1000 90 0 0 1")
+        lines.append("EN")
+        return "\n".join(lines) + "\n"
+
+
+class GeometryBatch:
+    """Many element layouts packed into shared flat arrays, indexed by per-design offsets."""
+
+    def __init__(self):
+        self.positions = array('d')
+        self.lengths = array('d')
+        self.offsets = array('l', [0])
+        self.kinds = []
+
+    def __len__(self) -> int:
+        return len(self.offsets) - 1
+
+    def append(self, geometry: ElementGeometry):
+        """Add one layout to the batch."""
+        self.positions.extend(geometry.positions)
+        self.lengths.extend(geometry.lengths)
+        self.kinds.extend(geometry.kinds)
+        self.offsets.append(len(self.positions))
+
+    def extend(self, geometries):
+        """Add several layouts to the batch."""
+        for geometry in geometries:
+            self.append(geometry)
+
+    def __getitem__(self, index: int) -> ElementGeometry:
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("geometry index out of range")
+        start, stop = self.offsets[index], self.offsets[index + 1]
+        return ElementGeometry(self.positions[start:stop], self.lengths[start:stop],
+                               self.kinds[start:stop])
+
+    def element_counts(self) -> array:
+        """Number of elements in each layout."""
+        o = self.offsets
+        return array('l', (o[i + 1] - o[i] for i in range(len(o) - 1)))
+
+    def boom_lengths(self) -> array:
+        """Boom length of every layout, computed over the flat position array."""
+        p, o = self.positions, self.offsets
+        return array('d', (max(p[o[i]:o[i + 1]]) - min(p[o[i]:o[i + 1]]) if o[i + 1] > o[i] else 0.0
+                           for i in range(len(o) - 1)))
+
+    def total_element_length(self) -> array:
+        """Total tubing or wire needed for the elements of every layout."""
+        l, o = self.lengths, self.offsets
+        return array('d', (sum(l[o[i]:o[i + 1]]) for i in range(len(o) - 1)))
@@ -0,0 +1,289 @@
+#!/usr/bin/env python3
+"""
+Log-Periodic Dipole Array Designer
+Carrel tau/sigma designs, LPDA-fed Yagi hybrids and vectorized design charts
+"""
+
+import math
+import sys
+from array import array
+from typing import Dict, Optional, Sequence
+
+from yagi_geometry import DIRECTOR, LOG_PERIODIC, ElementGeometry, GeometryBatch
+
+SPEED_OF_LIGHT = 299792458  # meters per second
+SIGMA_RANGE = (0.03, 0.25)  # relative spacings covered by Carrel's design chart
+
+
+def optimum_sigma(tau: float) -> float:
+    """Relative spacing giving the most gain for a scale factor (Carrel)."""
+    return 0.243 * tau - 0.051
+
+
+def estimated_gain(tau: float, sigma: float) -> float:
+    """Free-space gain in dBi, from a fit to the corrected Carrel design chart."""
+    gain_dbd = 5.0 + 18.0 * (tau - 0.8) - 250.0 * (sigma - optimum_sigma(tau)) ** 2
+    return 2.15 + max(gain_dbd, 0.0)
+
+
+def calculate_lpda(low_mhz: float, high_mhz: float, tau: float, sigma: float,
+                   wire_diameter: float, input_impedance: float = 50.0,
+                   feeder_diameter: Optional[float] = None) -> Dict:
+    """Design an LPDA covering low_mhz..high_mhz.
+
+    Elements are ordered from the longest (rear, at the boom origin) to the shortest.
+    """
+    if not 0 < low_mhz < high_mhz:
+        raise ValueError("Band must satisfy 0 < low < high")
+    if not 0.5 <= tau < 1:
+        raise ValueError("tau must be in [0.5, 1)")
+    if not SIGMA_RANGE[0] <= sigma <= SIGMA_RANGE[1]:
+        raise ValueError(f"sigma must be in [{SIGMA_RANGE[0]}, {SIGMA_RANGE[1]}]")
+    if wire_diameter <= 0:
+        raise ValueError("Wire diameter must be positive")
+    if input_impedance <= 0:
+        raise ValueError("Input impedance must be positive")
+    if feeder_diameter is not None and feeder_diameter <= 0:
+        raise ValueError("Feeder diameter must be positive")
+
+    alpha = math.atan((1 - tau) / (4 * sigma))
+    bandwidth = high_mhz / low_mhz
+    active_region = 1.1 + 7.7 * (1 - tau) ** 2 / math.tan(alpha)
+    structure_bandwidth = bandwidth * active_region
+    num_elements = math.ceil(1 + math.log(structure_bandwidth) / math.log(1 / tau))
+
+    longest_wavelength = SPEED_OF_LIGHT / (low_mhz * 1e6)
+    lengths = array('d', [longest_wavelength / 2])
+    positions = array('d', [0.0])
+    for _ in range(num_elements - 1):
+        spacing = 2 * sigma * lengths[-1]
+        positions.append(positions[-1] + spacing)
+        lengths.append(lengths[-1] * tau)
+    geometry = ElementGeometry(positions, lengths, [LOG_PERIODIC] * num_elements)
+
+    # Feeder impedance that gives the requested mean input resistance (Carrel)
+    mean_length = sum(lengths) / num_elements
+    element_impedance = 120 * (math.log(mean_length / wire_diameter) - 2.25)
+    if element_impedance <= 0:
+        raise ValueError("Wire diameter is too large for the element lengths")
+    sigma_prime = sigma / math.sqrt(tau)
+    ratio = input_impedance / (8 * sigma_prime * element_impedance)
+    feeder_impedance = input_impedance * (ratio + math.sqrt(ratio ** 2 + 1))
+    if feeder_diameter is None:
+        feeder_diameter = 2 * wire_diameter
+    feeder_spacing = feeder_diameter * math.cosh(feeder_impedance / 120)
+
+    return {
+        'family': 'lpda',
+        'low_frequency': low_mhz,
+        'high_frequency': high_mhz,
+        'tau': tau,
+        'sigma': sigma,
+        'alpha': math.degrees(alpha),
+        'num_elements': num_elements,
+        'element_lengths': list(lengths),
+        'element_positions': list(positions),
+        'total_boom': geometry.boom_length,
+        'gain': estimated_gain(tau, sigma),
+        'input_impedance': input_impedance,
+        'feeder_impedance': feeder_impedance,
+        'feeder_spacing': feeder_spacing,
+        'wire_diameter': wire_diameter,
+        'geometry': geometry
+    }
+
+
+def calculate_hybrid(low_mhz: float, high_mhz: float, tau: float, sigma: float,
+                     wire_diameter: float, yagi_mhz: float, num_directors: int,
+                     optimize_for: str = 'gain', input_impedance: float = 50.0) -> Dict:
+    """LPDA-fed Yagi: an LPDA for the whole range plus parasitic directors for one band.
+
+    The LPDA element nearest resonance at ``yagi_mhz`` plays the Yagi driven element; the
+    directors use the reference Yagi lengths and spacings measured from it, moved forward
+    if needed so they clear the front of the LPDA. The director gain increment is taken
+    from the reference Yagi, so it is optimistic when the directors end up far ahead.
+    """
+    from yagi_advanced_calculator import YagiCalculator
+    from yagi_batch import MAX_DIRECTORS
+
+    if not low_mhz <= yagi_mhz <= high_mhz:
+        raise ValueError("The Yagi frequency must lie inside the LPDA range")
+    if not 0 <= num_directors <= MAX_DIRECTORS:
+        raise ValueError(f"Number of directors must be between 0 and {MAX_DIRECTORS}")
+    lpda = calculate_lpda(low_mhz, high_mhz, tau, sigma, wire_diameter, input_impedance)
+    calculator = YagiCalculator()
+    gauge = min(calculator.WIRE_GAUGES, key=lambda g: abs(calculator.WIRE_GAUGES[g] / 1000 - wire_diameter))
+    parameters = {'num_directors': num_directors, 'wire_gauge': gauge,
+                  'boom_material': 'wood', 'optimize_for': optimize_for}
+    yagi = calculator.calculate_yagi(yagi_mhz, parameters)
+    bare = calculator.calculate_yagi(yagi_mhz, dict(parameters, num_directors=0))
+
+    lpda_geometry = lpda['geometry']
+    feed = min(range(len(lpda_geometry)),
+               key=lambda i: abs(lpda_geometry.lengths[i] - yagi['driven_length']))
+    front = max(lpda_geometry.positions)
+    first = lpda_geometry.positions[feed] + (yagi['director_spacings'][0] if num_directors else 0.0)
+    shift = max(0.0, front + 0.05 * yagi['wavelength'] - first)
+    director_positions = [lpda_geometry.positions[feed] + spacing + shift
+                          for spacing in yagi['director_spacings']]
+
+    geometry = ElementGeometry(list(lpda_geometry.positions) + director_positions,
+                               list(lpda_geometry.lengths) + list(yagi['director_lengths']),
+                               list(lpda_geometry.kinds) + [DIRECTOR] * num_directors)
+    result = dict(lpda)
+    result.update({
+        'family': 'hybrid',
+        'num_elements': len(geometry),
+        'element_lengths': list(geometry.lengths),
+        'element_positions': list(geometry.positions),
+        'yagi_frequency': yagi_mhz,
+        'num_directors': num_directors,
+        'director_lengths': list(yagi['director_lengths']),
+        'director_positions': director_positions,
+        'total_boom': geometry.boom_length,
+        # Directors add roughly what they add to a Yagi at the design frequency
+        'gain_at_yagi_frequency': lpda['gain'] + yagi['gain'] - bare['gain'],
+        'geometry': geometry
+    })
+    return result
+
+
+def design_chart(low_mhz: float, high_mhz: float, taus: Sequence[float], sigmas: Sequence[float],
+                 wire_diameter: float, input_impedance: float = 50.0) -> Dict:
+    """Evaluate every tau x sigma combination in one call.
+
+    Returns column arrays (one entry per combination, tau-major) plus a GeometryBatch
+    holding every layout, so the chart feeds straight into exporters and mechanical checks.
+    Combinations that cannot be designed are left out of the columns and listed under
+    ``skipped`` as (tau, sigma, reason).
+    """
+    columns = {key: array('d') for key in ('tau', 'sigma', 'alpha', 'gain', 'num_elements',
+                                            'total_boom', 'feeder_impedance')}
+    geometries = GeometryBatch()
+    skipped = []
+    for tau in taus:
+        for sigma in sigmas:
+            try:
+                design = calculate_lpda(low_mhz, high_mhz, tau, sigma, wire_diameter, input_impedance)
+            except ValueError as e:
+                skipped.append((tau, sigma, str(e)))
+                continue
+            for key in columns:
+                columns[key].append(design[key])
+            geometries.append(design['geometry'])
+    columns['geometries'] = geometries
+    columns['skipped'] = skipped
+    return columns
+
+
+def format_design(design: Dict) -> str:
+    """Plain-text report of an LPDA or hybrid design, in metric units."""
+    lines = [
+        f"{'LPDA-fed Yagi' if design['family'] == 'hybrid' else 'Log-periodic dipole array'}: "
+        f"{design['low_frequency']}-{design['high_frequency']} MHz",
+        f"tau={design['tau']:.3f}  sigma={design['sigma']:.3f}  alpha={design['alpha']:.1f}°",
+        f"Elements: {len(design['geometry'])}  Boom: {design['total_boom']:.3f} m  "
+        f"Gain: {design['gain']:.1f} dBi",
+        f"Feeder: {design['feeder_impedance']:.0f}Ω, {design['feeder_spacing'] * 1000:.1f} mm spacing "
+        f"for {design['input_impedance']:.0f}Ω input",
+    ]
+    if design['family'] == 'hybrid':
+        lines.append(f"Gain at {design['yagi_frequency']} MHz with directors: "
+                     f"{design['gain_at_yagi_frequency']:.1f} dBi")
+    geometry = design['geometry']
+    for label, position, length in zip(geometry.labels(), geometry.positions, geometry.lengths):
+        lines.append(f"  {label:<18}at {position:7.3f} m   length {length:7.3f} m")
+    return "\n".join(lines)
+
+
+def export_design(design: Dict, feeder_impedance: Optional[float] = None) -> str:
+    """Write the report, NEC model and SVG/DXF drawings of a design; returns the base filename.
+
+    The NEC model is evaluated at the Yagi frequency of a hybrid and at the geometric band
+    center of a plain LPDA. ``feeder_impedance`` overrides the designed feeder line impedance.
+    """
+    from yagi_drawing import render_dxf, render_svg
+
+    if feeder_impedance is None:
+        feeder_impedance = design['feeder_impedance']
+    if feeder_impedance <= 0:
+        raise ValueError("Feeder impedance must be positive")
+    if design['family'] == 'hybrid':
+        frequency = design['yagi_frequency']
+        base = (f"lpda_yagi_{design['low_frequency']}-{design['high_frequency']}MHz_"
+                f"{design['num_directors']}dir")
+        title = (f"LPDA-fed Yagi {design['low_frequency']}-{design['high_frequency']} MHz, "
+                 f"{design['num_directors']} directors for {design['yagi_frequency']} MHz")
+    else:
+        frequency = math.sqrt(design['low_frequency'] * design['high_frequency'])
+        base = f"lpda_{design['low_frequency']}-{design['high_frequency']}MHz"
+        title = f"LPDA {design['low_frequency']}-{design['high_frequency']} MHz, tau={design['tau']:.3f}"
+
+    with open(base + '.txt', 'w') as f:
+        f.write(format_design(design) + "\n")
+    with open(base + '.nec', 'w') as f:
+        f.write(design['geometry'].to_nec(frequency, design['wire_diameter'], comment=title,
+                                          feeder_impedance=feeder_impedance))
+    for extension, render in (('.svg', render_svg), ('.dxf', render_dxf)):
+        with open(base + extension, 'w') as f:
+            f.write(render(design['geometry'], 'metric', title))
+    return base
+
+
+def main(argv=None):
+    """Print an LPDA design, an LPDA-fed Yagi, or a tau/sigma chart."""
+    import argparse
+
+    from yagi_batch import MAX_DIRECTORS
+
+    parser = argparse.ArgumentParser(description="Log-periodic dipole array designer")
+    parser.add_argument('low', type=float, help="lowest frequency in MHz")
+    parser.add_argument('high', type=float, help="highest frequency in MHz")
+    parser.add_argument('--tau', type=float, default=0.9)
+    parser.add_argument('--sigma', type=float, help="relative spacing (default: optimum for tau)")
+    parser.add_argument('--wire-diameter', type=float, default=12.0, help="element diameter in mm")
+    parser.add_argument('--impedance', type=float, default=50.0, help="input impedance in ohms")
+    parser.add_argument('--yagi', type=float, help="add directors for this frequency (LPDA-fed Yagi)")
+    parser.add_argument('--directors', type=int, default=2, choices=range(MAX_DIRECTORS + 1),
+                        metavar=f"{{0-{MAX_DIRECTORS}}}")
+    parser.add_argument('--chart', action='store_true', help="print a tau/sigma design chart")
+    parser.add_argument('--export', action='store_true',
+                        help="write the report, NEC model and SVG/DXF drawings")
+    parser.add_argument('--feeder-impedance', type=float,
+                        help="feeder line impedance for the NEC model in ohms (default: designed value)")
+    args = parser.parse_args(argv)
+    diameter = args.wire_diameter / 1000
+
+    try:
+        if args.chart:
+            taus = [0.80 + 0.02 * i for i in range(9)]
+            sigmas = [0.06 + 0.02 * i for i in range(8)]
+            chart = design_chart(args.low, args.high, taus, sigmas, diameter, args.impedance)
+            print(f"{'tau':>6} {'sigma':>6} {'gain':>6} {'elem':>5} {'boom m':>8} {'feeder Ω':>9}")
+            for i in range(len(chart['tau'])):
+                print(f"{chart['tau'][i]:>6.2f} {chart['sigma'][i]:>6.2f} {chart['gain'][i]:>6.1f} "
+                      f"{int(chart['num_elements'][i]):>5} {chart['total_boom'][i]:>8.3f} "
+                      f"{chart['feeder_impedance'][i]:>9.0f}")
+            for tau, sigma, reason in chart['skipped']:
+                print(f"{tau:>6.2f} {sigma:>6.2f}  skipped: {reason}")
+            return
+        sigma = args.sigma if args.sigma is not None else optimum_sigma(args.tau)
+        if args.yagi is not None:
+            design = calculate_hybrid(args.low, args.high, args.tau, sigma, diameter,
+                                      args.yagi, args.directors, input_impedance=args.impedance)
+        else:
+            design = calculate_lpda(args.low, args.high, args.tau, sigma, diameter, args.impedance)
+        print(format_design(design))
+        if args.export:
+            base = export_design(design, args.feeder_impedance)
+            print(f"Saved {base}.txt, {base}.nec, {base}.svg and {base}.dxf")
+    except ValueError as e:
+        print(f"Error: {e}")
+        sys.exit(1)
+    except IOError as e:
+        print(f"Error saving files: {e}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
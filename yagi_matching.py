@@ -0,0 +1,279 @@
+#!/usr/bin/env python3
+"""
+Yagi Feedpoint Matching
+Closed-form gamma, T, hairpin and quarter-wave matches plus SWR curves
+"""
+
+import math
+from array import array
+from typing import Dict, Iterable, List, Optional, Sequence, Union
+
+SPEED_OF_LIGHT = 299792458  # meters per second
+
+# Approximate loaded Q of the driven element for each optimization mode.
+# Wide-bandwidth designs trade gain for a flatter impedance curve.
+FEEDPOINT_Q = {
+    'gain': 12.0,
+    'bandwidth': 7.0,
+    'f2b': 14.0,
+    'balanced': 10.0
+}
+
+MATCH_TYPES = ('gamma', 't_match', 'hairpin', 'quarter_wave')
+
+Impedance = Union[float, complex]
+
+
+def reflection_coefficient(z_load: Impedance, z0: float = 50.0) -> complex:
+    """Voltage reflection coefficient of a load on a line of impedance z0."""
+    z_load = complex(z_load)
+    return (z_load - z0) / (z_load + z0)
+
+
+def swr(z_load: Impedance, z0: float = 50.0) -> float:
+    """Standing wave ratio of a load on a line of impedance z0."""
+    gamma = abs(reflection_coefficient(z_load, z0))
+    if gamma >= 1.0:
+        return math.inf
+    return (1 + gamma) / (1 - gamma)
+
+
+def swr_batch(loads: Iterable[Impedance], z0: float = 50.0) -> array:
+    """SWR of many loads at once."""
+    return array('d', (swr(z, z0) for z in loads))
+
+
+def feedpoint_impedance(resistance: Impedance, frequency: float, design_frequency: float,
+                        q: float = FEEDPOINT_Q['balanced']) -> complex:
+    """Feedpoint impedance off resonance, modelled as a series RLC around the design frequency."""
+    z = complex(resistance)
+    detune = frequency / design_frequency - design_frequency / frequency
+    return complex(z.real, z.imag + q * z.real * detune)
+
+
+def band_frequencies(low: float, high: float, points: int = 21) -> List[float]:
+    """Evenly spaced frequencies across a band, including both edges."""
+    if points < 2:
+        return [(low + high) / 2]
+    step = (high - low) / (points - 1)
+    return [low + i * step for i in range(points)]
+
+
+def swr_curve(resistance: Impedance, design_frequency: float, frequencies: Sequence[float],
+              q: float = FEEDPOINT_Q['balanced'], z0: float = 50.0, matched: bool = True) -> array:
+    """SWR across a list of frequencies, either through an ideal match or fed directly."""
+    if matched:
+        # A lossless match scales the feedpoint to z0 at the design frequency;
+        # the loaded Q of the element still sets how fast the reactance grows.
+        reference = complex(z0)
+    else:
+        reference = complex(resistance)
+    return array('d', (swr(feedpoint_impedance(reference, f, design_frequency, q), z0)
+                       for f in frequencies))
+
+
+def swr_bandwidth(resistance: Impedance, design_frequency: float, q: float = FEEDPOINT_Q['balanced'],
+                  z0: float = 50.0, limit: float = 2.0) -> float:
+    """Width in MHz of the region around the design frequency where the matched SWR stays below ``limit``."""
+    # For a series RLC matched to z0, |X|/R = (limit - 1) / sqrt(limit) at the SWR limit
+    x_ratio = (limit - 1) / math.sqrt(limit)
+    half = x_ratio / (2 * q)
+    upper = design_frequency * (half + math.sqrt(half ** 2 + 1))
+    lower = design_frequency * (-half + math.sqrt(half ** 2 + 1))
+    return upper - lower
+
+
+def line_impedance(spacing: float, diameter_a: float, diameter_b: Optional[float] = None) -> float:
+    """Characteristic impedance of a two-conductor line in air."""
+    if diameter_b is None:
+        diameter_b = diameter_a
+    return 276 * math.log10(2 * spacing / math.sqrt(diameter_a * diameter_b))
+
+
+def dipole_impedance(length: float, diameter: float) -> float:
+    """Average characteristic impedance of a dipole, used for its reactance slope."""
+    return 120 * (math.log(2 * length / diameter) - 1)
+
+
+def quarter_wave_match(resistance: Impedance, frequency: float, z0: float = 50.0,
+                       velocity_factor: float = 0.66) -> Dict:
+    """Quarter-wave transformer from the feedpoint resistance to z0."""
+    r = complex(resistance).real
+    if r <= 0:
+        raise ValueError("Feedpoint resistance must be positive")
+    wavelength = SPEED_OF_LIGHT / (frequency * 1e6)
+    return {
+        'type': 'quarter_wave',
+        'line_impedance': math.sqrt(r * z0),
+        'line_length': velocity_factor * wavelength / 4,
+        'velocity_factor': velocity_factor
+    }
+
+
+def hairpin_match(resistance: Impedance, frequency: float, element_length: float,
+                  element_diameter: float, z0: float = 50.0,
+                  hairpin_spacing: Optional[float] = None,
+                  hairpin_diameter: Optional[float] = None) -> Dict:
+    """Hairpin (beta) match: shortened driven element plus a shunt shorted stub."""
+    z = complex(resistance)
+    r = z.real
+    if not 0 < r < z0:
+        raise ValueError("Hairpin match needs a feedpoint resistance below the line impedance")
+    wavelength = SPEED_OF_LIGHT / (frequency * 1e6)
+    omega = 2 * math.pi * frequency * 1e6
+    if hairpin_diameter is None:
+        hairpin_diameter = element_diameter
+    if hairpin_spacing is None:
+        hairpin_spacing = max(0.01 * wavelength, 4 * hairpin_diameter)
+
+    # L-network: series capacitive reactance in the element, shunt inductance across the feed
+    x_series = math.sqrt(r * (z0 - r))
+    x_shunt = z0 * math.sqrt(r / (z0 - r))
+
+    # Near resonance the dipole reactance slope is about pi * Za / wavelength per meter;
+    # any reactance already present at the feedpoint is tuned out by the same shortening
+    shortening = (x_series + z.imag) * wavelength / (math.pi * dipole_impedance(element_length, element_diameter))
+    z_stub = line_impedance(hairpin_spacing, hairpin_diameter)
+    hairpin_length = math.atan(x_shunt / z_stub) * wavelength / (2 * math.pi)
+    return {
+        'type': 'hairpin',
+        'element_shortening': shortening,
+        'driven_length': element_length - shortening,
+        'hairpin_length': hairpin_length,
+        'hairpin_spacing': hairpin_spacing,
+        'inductance': x_shunt / omega,
+        'series_reactance': -x_series,
+        'shunt_reactance': x_shunt
+    }
+
+
+def _tapped_match(resistance: Impedance, frequency: float, element_diameter: float, t_impedance: float,
+                  rod_diameter: Optional[float], rod_spacing: Optional[float]) -> Dict:
+    """Shared closed form for gamma and T matches.
+
+    ``t_impedance`` is the balanced input impedance of the equivalent full T; a gamma
+    is one half of a T, so it presents half that impedance to its coax.
+    """
+    z = complex(resistance)
+    r = z.real
+    if r <= 0:
+        raise ValueError("Feedpoint resistance must be positive")
+    wavelength = SPEED_OF_LIGHT / (frequency * 1e6)
+    omega = 2 * math.pi * frequency * 1e6
+    k = 2 * math.pi / wavelength
+    if rod_diameter is None:
+        rod_diameter = element_diameter
+    if rod_spacing is None:
+        rod_spacing = max(0.007 * wavelength, 4 * element_diameter)
+
+    # Folded-dipole step-up between rod and element, applied to the element impedance
+    # at the tap, which rises as 1 / cos^2 moving out from the center of a resonant dipole
+    step_up = (1 + math.log(2 * rod_spacing / rod_diameter) / math.log(2 * rod_spacing / element_diameter)) ** 2
+    ratio = math.sqrt(r * step_up / t_impedance)
+    if ratio >= 1:
+        raise ValueError("Feedpoint resistance too high for this rod geometry; use a thicker rod")
+    tap = math.acos(ratio) / k
+
+    # The rod and element form a shorted line; its inductive reactance is tuned out by a capacitor
+    reactance = line_impedance(rod_spacing, rod_diameter, element_diameter) * math.tan(k * tap) + z.imag
+    if reactance <= 0:
+        raise ValueError("Feedpoint is too capacitive for a series-capacitor match")
+    return {
+        'tap_distance': tap,
+        'rod_diameter': rod_diameter,
+        'rod_spacing': rod_spacing,
+        'step_up': step_up,
+        'rod_reactance': reactance,
+        'capacitance': 1 / (omega * reactance)
+    }
+
+
+def gamma_match(resistance: Impedance, frequency: float, element_diameter: float,
+                z0: float = 50.0, rod_diameter: Optional[float] = None,
+                rod_spacing: Optional[float] = None) -> Dict:
+    """Unbalanced gamma match fed directly from coax of impedance ``z0``."""
+    match = _tapped_match(resistance, frequency, element_diameter, 2 * z0, rod_diameter, rod_spacing)
+    match['type'] = 'gamma'
+    return match
+
+
+def t_match(resistance: Impedance, frequency: float, element_diameter: float,
+            z0: float = 50.0, rod_diameter: Optional[float] = None,
+            rod_spacing: Optional[float] = None) -> Dict:
+    """Balanced T-match fed through a 4:1 balun from coax of impedance ``z0``; one series capacitor per arm."""
+    match = _tapped_match(resistance, frequency, element_diameter, 4 * z0, rod_diameter, rod_spacing)
+    match['type'] = 't_match'
+    match['balun_ratio'] = 4
+    return match
+
+
+def design_match(match_type: str, resistance: Impedance, frequency: float, element_length: float,
+                 element_diameter: float, z0: float = 50.0) -> Dict:
+    """Design one match of the given type with default component geometry."""
+    if match_type == 'quarter_wave':
+        return quarter_wave_match(resistance, frequency, z0)
+    if match_type == 'hairpin':
+        return hairpin_match(resistance, frequency, element_length, element_diameter, z0)
+    if match_type == 'gamma':
+        return gamma_match(resistance, frequency, element_diameter, z0)
+    if match_type == 't_match':
+        return t_match(resistance, frequency, element_diameter, z0)
+    raise ValueError(f"Unknown match type: {match_type}")
+
+
+def design_matches(resistance: Impedance, frequency: float, element_length: float,
+                   element_diameter: float, z0: float = 50.0) -> Dict[str, Dict]:
+    """Every match type that is realizable for this feedpoint, keyed by type."""
+    matches = {}
+    for match_type in MATCH_TYPES:
+        try:
+            matches[match_type] = design_match(match_type, resistance, frequency,
+                                               element_length, element_diameter, z0)
+        except ValueError:
+            continue
+    return matches
+
+
+def design_matches_batch(match_type: str, resistances: Sequence[Impedance], frequencies: Sequence[float],
+                         element_lengths: Sequence[float], element_diameters: Sequence[float],
+                         z0: float = 50.0) -> List[Optional[Dict]]:
+    """Design one match type for many feedpoints; unrealizable entries are None."""
+    designs = []
+    for r, f, length, diameter in zip(resistances, frequencies, element_lengths, element_diameters):
+        try:
+            designs.append(design_match(match_type, r, f, length, diameter, z0))
+        except ValueError:
+            designs.append(None)
+    return designs
+
+
+def describe_match(match: Dict, format_length) -> str:
+    """One-line construction summary of a match, using the caller's length formatter."""
+    if match['type'] == 'quarter_wave':
+        return (f"Quarter-wave transformer: {match['line_impedance']:.0f}Ω line, "
+                f"{format_length(match['line_length'])} (VF {match['velocity_factor']})")
+    if match['type'] == 'hairpin':
+        return (f"Hairpin: shorten driven element by {format_length(match['element_shortening'])}, "
+                f"hairpin {format_length(match['hairpin_length'])} long, "
+                f"{format_length(match['hairpin_spacing'])} wide ({match['inductance'] * 1e9:.0f} nH)")
+    name = 'Gamma match' if match['type'] == 'gamma' else 'T-match (4:1 balun)'
+    capacitor = 'capacitor' if match['type'] == 'gamma' else 'capacitor per arm'
+    return (f"{name}: tap {format_length(match['tap_distance'])} from center, "
+            f"rod spacing {format_length(match['rod_spacing'])}, "
+            f"{match['capacitance'] * 1e12:.1f} pF {capacitor}")
+
+
+def matching_summary(results: Dict, frequency: float, optimize_for: str, format_length,
+                     z0: float = 50.0) -> List[str]:
+    """Report lines for the matching section of the calculator output."""
+    resistance = results['input_impedance']
+    q = FEEDPOINT_Q.get(optimize_for, FEEDPOINT_Q['balanced'])
+    lines = [
+        f"Unmatched SWR ({z0:.0f}Ω):   {swr(resistance, z0):.2f}:1",
+        f"2:1 SWR Bandwidth:     {swr_bandwidth(resistance, frequency, q, z0):.2f} MHz (matched)"
+    ]
+    matches = design_matches(resistance, frequency, results['driven_length'],
+                             results['wire_diameter'], z0)
+    for match in matches.values():
+        lines.append("• " + describe_match(match, format_length))
+    return lines
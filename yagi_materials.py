@@ -0,0 +1,231 @@
+#!/usr/bin/env python3
+"""
+Conductor and Boom Material Models
+Skin-effect loss, thermal expansion and boom dielectric loading from precomputed temperature tables
+"""
+
+import math
+from array import array
+from typing import Dict, List, Optional, Sequence
+
+from yagi_geometry import ElementGeometry
+
+MU0 = 4e-7 * math.pi  # H/m
+REFERENCE_TEMPERATURE = 20.0  # °C at which tabulated resistivities and element lengths apply
+
+# Table grid covering outdoor operation, in °C
+TABLE_MIN = -40.0
+TABLE_MAX = 85.0
+TABLE_STEP = 1.0
+
+# Resistivity at 20 °C (ohm m), resistivity temperature coefficient (1/K),
+# linear thermal expansion (1/K) and relative permeability
+CONDUCTORS = {
+    'copper': {'resistivity': 1.68e-8, 'temp_coefficient': 0.00393, 'expansion': 16.5e-6, 'permeability': 1.0},
+    'aluminum_1100': {'resistivity': 2.90e-8, 'temp_coefficient': 0.0042, 'expansion': 23.6e-6, 'permeability': 1.0},
+    'aluminum_6061': {'resistivity': 3.99e-8, 'temp_coefficient': 0.0036, 'expansion': 23.6e-6, 'permeability': 1.0},
+    'aluminum_6063': {'resistivity': 3.32e-8, 'temp_coefficient': 0.0039, 'expansion': 23.4e-6, 'permeability': 1.0},
+    'steel': {'resistivity': 1.43e-7, 'temp_coefficient': 0.0066, 'expansion': 12.0e-6, 'permeability': 100.0},
+    'stainless_304': {'resistivity': 7.2e-7, 'temp_coefficient': 0.00094, 'expansion': 17.3e-6, 'permeability': 1.0}
+}
+CONDUCTORS['aluminum'] = CONDUCTORS['aluminum_6063']  # common antenna tubing alloy
+
+# Relative permittivity of insulating booms; conductive booms need the
+# DL6WU-style boom correction instead of dielectric loading
+BOOM_DIELECTRICS = {
+    'wood': {'permittivity': 2.0, 'conductive': False},
+    'fiberglass': {'permittivity': 4.5, 'conductive': False},
+    'pvc': {'permittivity': 3.0, 'conductive': False},
+    'aluminum': {'permittivity': None, 'conductive': True},
+    'aluminum_non_isolated': {'permittivity': None, 'conductive': True},
+    'carbon_fiber': {'permittivity': None, 'conductive': True}
+}
+
+# Fraction of the boom diameter over which the element field sees the boom dielectric
+DIELECTRIC_FILL = 0.25
+
+
+class ConductorTable:
+    """Resistivity, skin-depth and expansion factors of one conductor sampled on the temperature grid."""
+
+    __slots__ = ('name', 'resistivity', 'skin_factor', 'expansion')
+
+    def __init__(self, name: str):
+        if name not in CONDUCTORS:
+            raise ValueError(f"Unknown conductor: {name}")
+        props = CONDUCTORS[name]
+        self.name = name
+        self.resistivity = array('d')
+        self.skin_factor = array('d')  # skin depth = skin_factor / sqrt(frequency in Hz)
+        self.expansion = array('d')  # length relative to the length at 20 °C
+        for i in range(int(round((TABLE_MAX - TABLE_MIN) / TABLE_STEP)) + 1):
+            delta = TABLE_MIN + i * TABLE_STEP - REFERENCE_TEMPERATURE
+            rho = props['resistivity'] * (1 + props['temp_coefficient'] * delta)
+            self.resistivity.append(rho)
+            self.skin_factor.append(math.sqrt(rho / (math.pi * MU0 * props['permeability'])))
+            self.expansion.append(1 + props['expansion'] * delta)
+
+    def _position(self, temperature: float):
+        """Table index and interpolation weight for a temperature."""
+        if not TABLE_MIN <= temperature <= TABLE_MAX:
+            raise ValueError(f"Temperature must be within {TABLE_MIN:.0f}..{TABLE_MAX:.0f} °C")
+        x = (temperature - TABLE_MIN) / TABLE_STEP
+        i = min(int(x), len(self.resistivity) - 2)
+        return i, x - i
+
+    def lookup(self, column: array, temperature: float) -> float:
+        """Linearly interpolated value of one table column."""
+        i, w = self._position(temperature)
+        return column[i] + (column[i + 1] - column[i]) * w
+
+
+_tables = {}
+
+
+def conductor_table(name: str) -> ConductorTable:
+    """Table for a conductor, built on first use and shared afterwards."""
+    table = _tables.get(name)
+    if table is None:
+        table = _tables[name] = ConductorTable(name)
+    return table
+
+
+def skin_depth(frequency: float, conductor: str = 'copper', temperature: float = REFERENCE_TEMPERATURE) -> float:
+    """Skin depth in meters at a frequency in MHz."""
+    table = conductor_table(conductor)
+    return table.lookup(table.skin_factor, temperature) / math.sqrt(frequency * 1e6)
+
+
+def resistance_per_meter(frequency: float, diameter: float, conductor: str = 'copper',
+                         temperature: float = REFERENCE_TEMPERATURE) -> float:
+    """RF resistance per meter of a round conductor, falling back to DC when the skin is thick."""
+    table = conductor_table(conductor)
+    rho = table.lookup(table.resistivity, temperature)
+    delta = table.lookup(table.skin_factor, temperature) / math.sqrt(frequency * 1e6)
+    if delta >= diameter / 2:
+        return rho / (math.pi * diameter ** 2 / 4)
+    return rho / (math.pi * delta * (diameter - delta))
+
+
+def loss_resistance_batch(lengths: Sequence[float], diameters: Sequence[float], frequencies: Sequence[float],
+                          temperatures: Sequence[float], conductor: str = 'copper') -> array:
+    """Feedpoint-referred loss resistance of half-wave elements, one value per row.
+
+    With a sinusoidal current distribution the loss seen at the center is half
+    the end-to-end RF resistance.
+    """
+    table = conductor_table(conductor)
+    resistivity = table.resistivity
+    skin = table.skin_factor
+    out = array('d')
+    for length, diameter, frequency, temperature in zip(lengths, diameters, frequencies, temperatures):
+        i, w = table._position(temperature)
+        rho = resistivity[i] + (resistivity[i + 1] - resistivity[i]) * w
+        delta = (skin[i] + (skin[i + 1] - skin[i]) * w) / math.sqrt(frequency * 1e6)
+        if delta >= diameter / 2:
+            per_meter = rho / (math.pi * diameter ** 2 / 4)
+        else:
+            per_meter = rho / (math.pi * delta * (diameter - delta))
+        out.append(per_meter * length / 2)
+    return out
+
+
+def element_loss(geometry: ElementGeometry, frequency: float, wire_diameter: float, radiation_resistance: float,
+                 conductor: str = 'copper', temperature: float = REFERENCE_TEMPERATURE) -> Dict:
+    """Conductor loss of a whole antenna.
+
+    Every element is taken to carry the feed current, which overstates the loss of
+    parasitic elements and so gives an upper bound.
+    """
+    if len(geometry) == 0 or min(geometry.lengths) <= 0:
+        raise ValueError("Element lengths must be positive")
+    if radiation_resistance <= 0:
+        raise ValueError("Radiation resistance must be positive")
+    # All elements share conductor, diameter, frequency and temperature, so one
+    # per-meter resistance covers the summed length (half of it at the feedpoint)
+    loss = resistance_per_meter(frequency, wire_diameter, conductor, temperature) * sum(geometry.lengths) / 2
+    efficiency = radiation_resistance / (radiation_resistance + loss)
+    return {
+        'loss_resistance': loss,
+        'efficiency': efficiency,
+        'loss_db': -10 * math.log10(efficiency)
+    }
+
+
+def expansion_factor(conductor: str, temperature: float) -> float:
+    """Length at a temperature relative to the length at 20 °C."""
+    table = conductor_table(conductor)
+    return table.lookup(table.expansion, temperature)
+
+
+def expansion_batch(temperatures: Sequence[float], conductor: str = 'copper') -> array:
+    """expansion_factor for many temperatures."""
+    table = conductor_table(conductor)
+    expansion = table.expansion
+    out = array('d')
+    for temperature in temperatures:
+        i, w = table._position(temperature)
+        out.append(expansion[i] + (expansion[i + 1] - expansion[i]) * w)
+    return out
+
+
+def thermal_geometry(geometry: ElementGeometry, temperature: float, element_conductor: str = 'copper',
+                     boom_conductor: str = 'aluminum') -> ElementGeometry:
+    """Layout at a temperature: elements and boom expand with their own materials about the first element."""
+    element_scale = expansion_factor(element_conductor, temperature)
+    boom_scale = expansion_factor(boom_conductor, temperature) if boom_conductor in CONDUCTORS else 1.0
+    origin = min(geometry.positions) if len(geometry) else 0.0
+    return ElementGeometry([origin + (x - origin) * boom_scale for x in geometry.positions],
+                           [length * element_scale for length in geometry.lengths], geometry.kinds)
+
+
+def resonance_shift(frequency: float, temperature: float, conductor: str = 'copper') -> float:
+    """Resonant frequency in MHz of an element cut for ``frequency`` at 20 °C."""
+    return frequency / expansion_factor(conductor, temperature)
+
+
+def dielectric_shortening(boom_material: str, boom_diameter: float) -> float:
+    """Length in meters to remove from an element passing through an insulating boom.
+
+    Conductive booms return 0; their correction depends on the mounting and is
+    handled by the boom correction of each calculator.
+    """
+    props = BOOM_DIELECTRICS.get(boom_material)
+    if props is None:
+        raise ValueError(f"Unknown boom material: {boom_material}")
+    if props['conductive']:
+        return 0.0
+    return (math.sqrt(props['permittivity']) - 1) * boom_diameter * DIELECTRIC_FILL
+
+
+def materials_summary(results: Dict, frequency: float, format_length, conductor: str = 'copper',
+                      boom_material: Optional[str] = None, boom_diameter: Optional[float] = None,
+                      temperature_range=(-30.0, 50.0)) -> List[str]:
+    """Report lines for the materials and temperature section of the calculator output.
+
+    A design the loss model cannot represent (e.g. non-positive element lengths) gets a
+    warning line instead of the section.
+    """
+    geometry = results['geometry']
+    low, high = temperature_range
+    try:
+        nominal = element_loss(geometry, frequency, results['wire_diameter'], results['input_impedance'], conductor)
+        hot = element_loss(geometry, frequency, results['wire_diameter'], results['input_impedance'], conductor, high)
+    except ValueError as e:
+        return [f"Warning: materials analysis skipped ({e}); check the design inputs"]
+    lines = [
+        f"Conductor loss ({conductor.replace('_', ' ')}): {nominal['loss_db']:.3f} dB at 20 °C, "
+        f"{hot['loss_db']:.3f} dB at {high:.0f} °C (upper bound)",
+        f"Skin depth:            {skin_depth(frequency, conductor) * 1e6:.1f} µm",
+        f"Resonance drift:       {(resonance_shift(frequency, low, conductor) - frequency) * 1000:+.1f} kHz at "
+        f"{low:.0f} °C, {(resonance_shift(frequency, high, conductor) - frequency) * 1000:+.1f} kHz at {high:.0f} °C",
+        f"Driven element change: {format_length(results['driven_length'] * (expansion_factor(conductor, high) - expansion_factor(conductor, low)))} "
+        f"over {low:.0f}..{high:.0f} °C"
+    ]
+    if boom_material is not None and boom_diameter is not None:
+        shortening = dielectric_shortening(boom_material, boom_diameter)
+        if shortening:
+            lines.append(f"Boom dielectric ({boom_material.replace('_', ' ')}, "
+                         f"εr {BOOM_DIELECTRICS[boom_material]['permittivity']:.1f}): shorten elements through "
+                         f"a {boom_diameter * 1000:.0f} mm boom by about {format_length(shortening)}")
+    return lines
@@ -0,0 +1,214 @@
+#!/usr/bin/env python3
+"""
+Yagi Mechanical Analysis
+Wind load, boom bending and element deflection for booms mounted at their center
+"""
+
+import math
+from array import array
+from typing import Dict, List, Optional, Sequence
+
+from yagi_geometry import ElementGeometry, GeometryBatch
+
+GRAVITY = 9.80665  # m/s^2
+AIR_DENSITY = 1.225  # kg/m^3 at sea level, 15 °C
+CYLINDER_DRAG = 1.2  # drag coefficient of a long round tube
+
+# Density (kg/m^3), Young's modulus (Pa) and yield / flexural strength (Pa)
+BOOM_MATERIALS = {
+    'wood': {'density': 450, 'modulus': 10e9, 'yield_strength': 40e6},
+    'aluminum': {'density': 2700, 'modulus': 68.9e9, 'yield_strength': 276e6},
+    'fiberglass': {'density': 1900, 'modulus': 20e9, 'yield_strength': 200e6},
+    'pvc': {'density': 1400, 'modulus': 3e9, 'yield_strength': 45e6},
+    'carbon_fiber': {'density': 1600, 'modulus': 70e9, 'yield_strength': 600e6}
+}
+BOOM_MATERIALS['aluminum_non_isolated'] = BOOM_MATERIALS['aluminum']
+
+ELEMENT_MATERIALS = {
+    'copper': {'density': 8960, 'modulus': 117e9, 'yield_strength': 70e6},
+    'aluminum': BOOM_MATERIALS['aluminum']
+}
+
+# Wall thickness of tubular booms in meters; wood booms are solid
+DEFAULT_WALL = {
+    'wood': None,
+    'aluminum': 0.0015,
+    'aluminum_non_isolated': 0.0015,
+    'fiberglass': 0.002,
+    'pvc': 0.002,
+    'carbon_fiber': 0.0015
+}
+
+
+def kmh_to_ms(speed_kmh: float) -> float:
+    """Convert a wind speed from km/h to m/s."""
+    return speed_kmh / 3.6
+
+
+def wind_pressure(speed: float, air_density: float = AIR_DENSITY) -> float:
+    """Dynamic wind pressure in Pa for a wind speed in m/s."""
+    return 0.5 * air_density * speed ** 2
+
+
+def round_section(diameter: float, wall: Optional[float] = None):
+    """Return (cross-section area, second moment of area) of a round tube or solid rod."""
+    inner = 0.0 if wall is None else max(diameter - 2 * wall, 0.0)
+    area = math.pi / 4 * (diameter ** 2 - inner ** 2)
+    inertia = math.pi / 64 * (diameter ** 4 - inner ** 4)
+    return area, inertia
+
+
+def _cantilever(loads, uniform: float, length: float, stiffness: float):
+    """Root moment and tip deflection of a cantilever under a uniform load plus point loads.
+
+    ``loads`` is a sequence of (distance from the support, force) pairs.
+    """
+    moment = uniform * length ** 2 / 2
+    deflection = uniform * length ** 4 / (8 * stiffness)
+    for a, force in loads:
+        a = min(a, length)
+        moment += force * a
+        deflection += force * a ** 2 * (3 * length - a) / (6 * stiffness)
+    return moment, deflection
+
+
+def _loads(positions: Sequence[float], lengths: Sequence[float], boom_diameter: float, wire_diameter: float,
+           wind_speed: float, boom_material: str, element_material: str, boom_wall: Optional[float],
+           boom_overhang: float) -> Dict:
+    """analyze on plain position and length sequences, so batches need no ElementGeometry per design."""
+    boom = BOOM_MATERIALS[boom_material]
+    element = ELEMENT_MATERIALS[element_material]
+    if boom_wall is None:
+        boom_wall = DEFAULT_WALL.get(boom_material)
+    q = wind_pressure(wind_speed)
+    count = len(positions)
+
+    # Wind area
+    first = min(positions) if count else 0.0
+    boom_length = (max(positions) - first if count else 0.0) + 2 * boom_overhang
+    boom_area = boom_length * boom_diameter
+    element_area = sum(lengths) * wire_diameter
+    wind_area = boom_area + element_area
+
+    # Boom bending about the mast clamp
+    section_area, inertia = round_section(boom_diameter, boom_wall)
+    stiffness = boom['modulus'] * inertia
+    half = boom_length / 2
+    center = first - boom_overhang + half if count else 0.0
+    wire_area = math.pi / 4 * wire_diameter ** 2
+    boom_weight = boom['density'] * section_area * GRAVITY
+    boom_wind = q * CYLINDER_DRAG * boom_diameter
+
+    moment = 0.0
+    sag = 0.0
+    deflection = 0.0
+    for side in (-1, 1):
+        point_loads = [(abs(x - center), element['density'] * wire_area * length * GRAVITY)
+                       for x, length in zip(positions, lengths)
+                       if (x - center) * side > 0]
+        gravity_moment, side_sag = _cantilever(point_loads, boom_weight, half, stiffness)
+        wind_moment, side_deflection = _cantilever((), boom_wind, half, stiffness)
+        moment = max(moment, math.hypot(gravity_moment, wind_moment))
+        sag = max(sag, side_sag)
+        deflection = max(deflection, side_deflection)
+
+    boom_stress = moment * (boom_diameter / 2) / inertia
+
+    # Elements are cantilevers from the boom with a uniform wind and weight load
+    _, element_inertia = round_section(wire_diameter)
+    element_stiffness = element['modulus'] * element_inertia
+    element_wind = q * CYLINDER_DRAG * wire_diameter
+    element_weight = element['density'] * wire_area * GRAVITY
+    longest = max(lengths) / 2 if count else 0.0
+    element_moment, element_deflection = _cantilever((), element_wind, longest, element_stiffness)
+    _, element_sag = _cantilever((), element_weight, longest, element_stiffness)
+    element_stress = element_moment * (wire_diameter / 2) / element_inertia
+
+    return {
+        'wind_speed': wind_speed,
+        'wind_area': wind_area,
+        'wind_force': q * CYLINDER_DRAG * wind_area,
+        'boom_moment': moment,
+        'boom_stress': boom_stress,
+        'boom_safety_factor': boom['yield_strength'] / boom_stress if boom_stress else math.inf,
+        'boom_sag': sag,
+        'boom_deflection': deflection,
+        'element_deflection': element_deflection,
+        'element_sag': element_sag,
+        'element_stress': element_stress,
+        'element_safety_factor': element['yield_strength'] / element_stress if element_stress else math.inf
+    }
+
+
+def analyze(geometry: ElementGeometry, boom_diameter: float, wire_diameter: float,
+            wind_speed: float, boom_material: str = 'aluminum', element_material: str = 'copper',
+            boom_wall: Optional[float] = None, boom_overhang: float = 0.0) -> Dict:
+    """Mechanical loads of one antenna at a wind speed in m/s.
+
+    The boom is clamped to the mast at its center, so each half acts as a cantilever
+    carrying the elements on that side. Wind is taken broadside to whichever part is
+    being checked, which is the worst case for each.
+    """
+    return _loads(geometry.positions, geometry.lengths, boom_diameter, wire_diameter, wind_speed,
+                  boom_material, element_material, boom_wall, boom_overhang)
+
+
+def passes(positions: Sequence[float], lengths: Sequence[float], boom_diameter: float, wire_diameter: float,
+           wind_speed: float, boom_material: str = 'aluminum', element_material: str = 'copper',
+           min_safety_factor: float = 1.5, max_boom_sag: Optional[float] = None,
+           boom_wall: Optional[float] = None) -> bool:
+    """Whether one layout survives the wind speed with the given margin.
+
+    ``max_boom_sag`` defaults to 1% of the boom length. Layouts with non-positive
+    element lengths never pass.
+    """
+    if not len(lengths) or min(lengths) <= 0:
+        return False
+    loads = _loads(positions, lengths, boom_diameter, wire_diameter, wind_speed,
+                   boom_material, element_material, boom_wall, 0.0)
+    sag_limit = 0.01 * (max(positions) - min(positions)) if max_boom_sag is None else max_boom_sag
+    return (loads['boom_safety_factor'] >= min_safety_factor
+            and loads['element_safety_factor'] >= min_safety_factor
+            and loads['boom_sag'] <= sag_limit)
+
+
+def analyze_batch(batch: GeometryBatch, boom_diameters: Sequence[float], wire_diameters: Sequence[float],
+                  wind_speed: float, boom_material: str = 'aluminum', element_material: str = 'copper',
+                  boom_wall: Optional[float] = None) -> Dict[str, array]:
+    """Mechanical loads for every layout in a batch, returned column-wise."""
+    columns = {}
+    p, l, o = batch.positions, batch.lengths, batch.offsets
+    for i in range(len(batch)):
+        result = _loads(p[o[i]:o[i + 1]], l[o[i]:o[i + 1]], boom_diameters[i], wire_diameters[i], wind_speed,
+                        boom_material, element_material, boom_wall, 0.0)
+        for key, value in result.items():
+            columns.setdefault(key, array('d')).append(value)
+    return columns
+
+
+def feasible(batch: GeometryBatch, boom_diameters: Sequence[float], wire_diameters: Sequence[float],
+             wind_speed: float, boom_material: str = 'aluminum', element_material: str = 'copper',
+             min_safety_factor: float = 1.5, max_boom_sag: Optional[float] = None) -> array:
+    """Mask (1 = passes) of layouts that survive the wind speed with the given margin; see passes."""
+    p, l, o = batch.positions, batch.lengths, batch.offsets
+    return array('b', (passes(p[o[i]:o[i + 1]], l[o[i]:o[i + 1]], boom_diameters[i], wire_diameters[i],
+                              wind_speed, boom_material, element_material, min_safety_factor, max_boom_sag)
+                       for i in range(len(batch))))
+
+
+def mechanical_summary(geometry: ElementGeometry, boom_diameter: float, wire_diameter: float, wind_kmh: float,
+                       format_length, boom_material: str = 'aluminum') -> List[str]:
+    """Report lines for the mechanical section of the calculator output."""
+    if not len(geometry) or min(geometry.lengths) <= 0:
+        return ["Warning: mechanical analysis skipped (element lengths must be positive); check the design inputs"]
+    mech = analyze(geometry, boom_diameter, wire_diameter, kmh_to_ms(wind_kmh), boom_material)
+    lines = [
+        f"Wind Area:           {mech['wind_area']:.3f} m²",
+        f"Wind Force:          {mech['wind_force']:.0f} N",
+        f"Boom Safety Factor:  {mech['boom_safety_factor']:.1f}",
+        f"Boom Sag (weight):   {format_length(mech['boom_sag'])}",
+        f"Element Deflection:  {format_length(mech['element_deflection'])}"
+    ]
+    if mech['element_safety_factor'] < 1:
+        lines.append("• Elements would yield at this wind speed - use tubing or add supports")
+    return lines
@@ -0,0 +1,213 @@
+#!/usr/bin/env python3
+"""
+Shared-Memory Worker Pool
+Persistent worker processes that exchange packed design batches through shared memory
+"""
+
+import multiprocessing as mp
+import os
+import queue
+from array import array
+from concurrent.futures import CancelledError
+from multiprocessing import shared_memory
+from typing import Iterable, Iterator, Optional, Sequence
+
+from yagi_batch import RESULT_WIDTH, SPEC_WIDTH, evaluate_rows
+
+_ITEM_SIZE = array('d').itemsize
+
+# Status codes sent back from workers alongside the slot index
+_DONE = 0
+_CANCELLED = 1
+_FAILED = 2
+
+
+def _worker(spec_name: str, result_name: str, chunk_size: int, tasks, done, cancel_event):
+    """Worker loop: evaluate the spec rows of each slot into the matching result slot."""
+    specs = shared_memory.SharedMemory(name=spec_name)
+    results = shared_memory.SharedMemory(name=result_name)
+    spec_view = specs.buf.cast('d')
+    result_view = results.buf.cast('d')
+    try:
+        while True:
+            task = tasks.get()
+            if task is None:
+                break
+            slot, count = task
+            if cancel_event.is_set():
+                done.put((slot, _CANCELLED, None))
+                continue
+            try:
+                evaluate_rows(spec_view, result_view, count,
+                              slot * chunk_size * SPEC_WIDTH, slot * chunk_size * RESULT_WIDTH)
+            except Exception as e:
+                done.put((slot, _FAILED, f"{type(e).__name__}: {e}"))
+            else:
+                done.put((slot, _DONE, None))
+    finally:
+        spec_view.release()
+        result_view.release()
+        specs.close()
+        results.close()
+
+
+class SharedMemoryPool:
+    """Pool of persistent workers fed through a ring of shared-memory slots.
+
+    Each slot holds up to ``chunk_size`` packed spec rows and the same number of
+    result rows. Only slot indices travel through the control queues, so neither
+    geometry nor results are pickled. A batch can only be submitted when a slot is
+    free, which bounds memory and applies backpressure to the producer.
+    """
+
+    def __init__(self, workers: Optional[int] = None, chunk_size: int = 256,
+                 slots: Optional[int] = None):
+        self.workers = workers or os.cpu_count() or 1
+        self.chunk_size = chunk_size
+        self.slots = slots or 2 * self.workers
+        self._specs = shared_memory.SharedMemory(
+            create=True, size=self.slots * chunk_size * SPEC_WIDTH * _ITEM_SIZE)
+        self._results = shared_memory.SharedMemory(
+            create=True, size=self.slots * chunk_size * RESULT_WIDTH * _ITEM_SIZE)
+        self._spec_view = self._specs.buf.cast('d')
+        self._result_view = self._results.buf.cast('d')
+        self._tasks = mp.Queue()
+        self._done = mp.Queue()
+        self._cancel = mp.Event()
+        self._processes = [
+            mp.Process(target=_worker, daemon=True,
+                       args=(self._specs.name, self._results.name, chunk_size,
+                             self._tasks, self._done, self._cancel))
+            for _ in range(self.workers)
+        ]
+        for process in self._processes:
+            process.start()
+        self._closed = False
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def cancel(self):
+        """Ask the workers to skip queued slots; the running ``imap`` raises CancelledError."""
+        self._cancel.set()
+
+    def _wait(self, timeout: float = 1.0):
+        """Wait for a finished slot, noticing workers that died."""
+        while True:
+            try:
+                return self._done.get(timeout=timeout)
+            except queue.Empty:
+                if not all(process.is_alive() for process in self._processes):
+                    raise RuntimeError("A pool worker exited unexpectedly")
+
+    def imap_chunks(self, chunks: Iterable[Sequence[float]]) -> Iterator[array]:
+        """Evaluate packed spec chunks, yielding packed result chunks in input order.
+
+        Chunks are pulled from ``chunks`` only when a slot is free, so a lazy
+        producer never runs more than ``slots`` chunks ahead of the consumer.
+        """
+        if self._closed:
+            raise ValueError("Pool is closed")
+        self._cancel.clear()
+        free = list(range(self.slots))
+        pending = {}  # sequence number -> (slot, row count)
+        finished = {}  # slot -> (status, message)
+        next_in = 0
+        next_out = 0
+        source = iter(chunks)
+        exhausted = False
+        try:
+            while not exhausted or next_out < next_in:
+                # Fill every free slot before blocking
+                while free and not exhausted and not self._cancel.is_set():
+                    try:
+                        chunk = next(source)
+                    except StopIteration:
+                        exhausted = True
+                        break
+                    count = len(chunk) // SPEC_WIDTH
+                    if count > self.chunk_size:
+                        raise ValueError(f"Chunk has {count} rows; pool slots hold {self.chunk_size}")
+                    slot = free.pop()
+                    start = slot * self.chunk_size * SPEC_WIDTH
+                    self._spec_view[start:start + len(chunk)] = array('d', chunk)
+                    pending[next_in] = (slot, count)
+                    next_in += 1
+                    self._tasks.put((slot, count))
+                if self._cancel.is_set() and not pending:
+                    raise CancelledError()
+                if next_out == next_in:
+                    continue
+
+                # Release slots strictly in order so output order matches input order
+                slot, count = pending[next_out]
+                while slot not in finished:
+                    done_slot, status, message = self._wait()
+                    finished[done_slot] = (status, message)
+                status, message = finished.pop(slot)
+                del pending[next_out]
+                next_out += 1
+                if status == _FAILED:
+                    raise RuntimeError(f"Worker failed: {message}")
+                if status == _CANCELLED or self._cancel.is_set():
+                    free.append(slot)
+                    continue
+                start = slot * self.chunk_size * RESULT_WIDTH
+                rows = array('d', self._result_view[start:start + count * RESULT_WIDTH])
+                free.append(slot)
+                yield rows
+            if self._cancel.is_set():
+                raise CancelledError()
+        finally:
+            # Drain slots still in flight so the next call starts from a clean ring
+            outstanding = len(pending) - sum(1 for slot, _ in pending.values() if slot in finished)
+            for _ in range(outstanding):
+                self._wait()
+
+    def imap(self, specs: Iterable[float]) -> Iterator[array]:
+        """Evaluate a flat stream of spec values, yielding result chunks in order."""
+        return self.imap_chunks(_rechunk(specs, self.chunk_size * SPEC_WIDTH))
+
+    def evaluate(self, specs: Sequence[float]) -> array:
+        """Evaluate a flat array of spec rows and return all result rows."""
+        out = array('d')
+        for rows in self.imap(specs):
+            out.extend(rows)
+        return out
+
+    def close(self):
+        """Stop the workers and release the shared memory."""
+        if self._closed:
+            return
+        self._closed = True
+        for _ in self._processes:
+            self._tasks.put(None)
+        for process in self._processes:
+            process.join(timeout=5)
+            if process.is_alive():
+                process.terminate()
+        self._spec_view.release()
+        self._result_view.release()
+        self._specs.close()
+        self._results.close()
+        self._specs.unlink()
+        self._results.unlink()
+
+
+def _rechunk(values: Iterable[float], size: int) -> Iterator[array]:
+    """Split a flat sequence or stream of floats into arrays of at most ``size`` values."""
+    if isinstance(values, (array, list, tuple, memoryview)):
+        for start in range(0, len(values), size):
+            yield array('d', values[start:start + size])
+        return
+    chunk = array('d')
+    for value in values:
+        chunk.append(value)
+        if len(chunk) == size:
+            yield chunk
+            chunk = array('d')
+    if chunk:
+        yield chunk
@@ -0,0 +1,338 @@
+#!/usr/bin/env python3
+"""
+Multi-Session Calculator Server
+Asyncio line-protocol server hosting many non-isolated Yagi calculator sessions in one process
+"""
+
+import asyncio
+import contextlib
+import io
+import math
+import sys
+from collections import OrderedDict
+from typing import Callable, Dict, Optional, Tuple
+
+from yagi_batch import MAX_DIRECTORS, load_non_isolated
+
+PROMPT = "yagi> "
+CLEAR_SCREEN = "\033[2J\033[H"  # ANSI erase display and cursor home, interpreted by the client's terminal
+MAX_LINE = 1024
+
+HELP = """Commands:
+  set frequency <MHz>       set directors <n>        set gauge <AWG>
+  set boom <mm>             set optimize gain|bandwidth|f2b
+  set units metric|imperial set region 1|2|3
+  show       current settings          bands      amateur bands for the region
+  calc       full design report        json       design as JSON
+  clear      clear the screen          help       this list
+  quit       end the session"""
+
+OPTIMIZE_MODES = ('gain', 'bandwidth', 'f2b')
+
+
+class DesignCache:
+    """LRU cache of calculated designs and their rendered reports, shared by all sessions.
+
+    Cached results are shared between sessions and must be treated as read-only.
+    """
+
+    def __init__(self, maxsize: int = 4096):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: Tuple, compute: Callable[[], object]):
+        """Cached value for key, computing and storing it on a miss."""
+        entries = self._entries
+        if key in entries:
+            entries.move_to_end(key)
+            self.hits += 1
+            return entries[key]
+        self.misses += 1
+        value = compute()
+        entries[key] = value
+        if len(entries) > self.maxsize:
+            entries.popitem(last=False)
+        return value
+
+
+def _captured(func, *args) -> str:
+    """Run a printing calculator method and return what it printed."""
+    buffer = io.StringIO()
+    with contextlib.redirect_stdout(buffer):
+        func(*args)
+    return buffer.getvalue()
+
+
+def preload():
+    """Build the shared tables once, before the first session needs them."""
+    from yagi_bands import default_band_plan
+    from yagi_materials import conductor_table
+    import yagi_matching  # noqa: F401
+    import yagi_mechanics  # noqa: F401
+
+    default_band_plan()
+    conductor_table('copper')
+
+
+class Session:
+    """State of one connected operator: its own calculator settings and last results."""
+
+    def __init__(self, session_id: int, cache: DesignCache):
+        self.id = session_id
+        self.cache = cache
+        self.calculator = load_non_isolated().NonIsolatedYagiCalculator()
+        self.results = None
+
+    def _design_key(self) -> Tuple:
+        c = self.calculator
+        return (c.frequency_mhz, c.num_directors, c.wire_gauge, c.boom_diameter_mm, c.optimize_for)
+
+    def _calculate(self):
+        if self.calculator.frequency_mhz <= 0:
+            raise ValueError("Set a frequency first (set frequency <MHz>)")
+        key = self._design_key()
+        self.results = self.cache.get(('results',) + key, lambda: _captured_results(self.calculator))
+        return key
+
+    def _set(self, name: str, value: str) -> str:
+        c = self.calculator
+        if name == 'frequency':
+            frequency = float(value)
+            if not math.isfinite(frequency) or frequency <= 0:
+                raise ValueError("Frequency must be positive")
+            c.frequency_mhz = frequency
+            from yagi_bands import describe_frequency
+
+            reply = f"✓ Frequency set to {frequency} MHz\n  {describe_frequency(frequency, c.itu_region)}"
+            if frequency < 1 or frequency > 10000:
+                reply += "\nWarning: Frequency outside typical amateur radio range!"
+            return reply
+        if name == 'directors':
+            directors = int(value)
+            if not 0 <= directors <= MAX_DIRECTORS:
+                raise ValueError(f"Number of directors must be 0-{MAX_DIRECTORS}")
+            c.num_directors = directors
+            reply = f"✓ Number of directors set to {directors}"
+            if directors > 20:
+                reply += "\nWarning: Very high director count may not be practical!"
+            return reply
+        if name == 'gauge':
+            if value not in c.WIRE_GAUGES:
+                raise ValueError(f"Wire gauge must be one of {', '.join(c.WIRE_GAUGES)}")
+            c.wire_gauge = value
+            return f"✓ Wire gauge set to {value} AWG ({c.WIRE_GAUGES[value]}mm diameter)"
+        if name == 'boom':
+            diameter = float(value)
+            if not math.isfinite(diameter) or diameter <= 0:
+                raise ValueError("Diameter must be positive")
+            c.boom_diameter_mm = diameter
+            reply = f"✓ Boom diameter set to {diameter} mm"
+            if diameter > 100:
+                reply += "\nWarning: Very large boom diameter may not be accurate!"
+            return reply
+        if name == 'optimize':
+            if value not in OPTIMIZE_MODES:
+                raise ValueError(f"Optimization must be one of {', '.join(OPTIMIZE_MODES)}")
+            c.optimize_for = value
+            return f"✓ Optimization set to {value}"
+        if name == 'units':
+            if value not in ('metric', 'imperial'):
+                raise ValueError("Units must be metric or imperial")
+            c.units = value
+            return f"✓ Units set to {value.title()}"
+        if name == 'region':
+            region = int(value)
+            if region not in (1, 2, 3):
+                raise ValueError("ITU region must be 1, 2 or 3")
+            c.itu_region = region
+            return f"✓ ITU region set to {region}"
+        raise ValueError(f"Unknown setting: {name}")
+
+    def handle(self, line: str) -> Tuple[str, bool]:
+        """Execute one command line; returns (reply text, session finished)."""
+        words = line.split()
+        if not words:
+            return "", False
+        command = words[0].lower()
+        try:
+            if command in ('quit', 'exit'):
+                return "Thank you for using Non-Isolated Yagi Calculator!", True
+            if command in ('help', 'menu', '?'):
+                return HELP, False
+            if command == 'clear':
+                return CLEAR_SCREEN, False
+            if command == 'set':
+                if len(words) != 3:
+                    raise ValueError("Usage: set <setting> <value>")
+                return self._set(words[1].lower(), words[2]), False
+            if command == 'show':
+                return _captured(self.calculator.show_settings).rstrip(), False
+            if command == 'bands':
+                from yagi_bands import default_band_plan
+
+                region = self.calculator.itu_region
+                return "\n".join([f"Amateur bands (ITU Region {region}):"] +
+                                 [f"  {band.name + ':':<7}{band.low:g}-{band.high:g} MHz"
+                                  for band in default_band_plan().bands(region)]), False
+            if command == 'calc':
+                key = self._calculate()
+                report = self.cache.get(('report', self.calculator.units) + key,
+                                        lambda: _captured(self.calculator.display_results, self.results))
+                return report.rstrip(), False
+            if command == 'json':
+                import json
+
+                key = self._calculate()
+
+                def render():
+                    output = {k: v for k, v in self.results.items() if k != 'geometry'}
+                    output['element_positions'] = list(self.results['geometry'].positions)
+                    return json.dumps(output)
+
+                return self.cache.get(('json',) + key, render), False
+        except ValueError as e:
+            return f"Error: {e}", False
+        except ArithmeticError:
+            # Extreme but finite settings can overflow or divide by zero inside the calculator
+            return "Error: settings are outside the range the calculator can evaluate", False
+        return f"Unknown command: {command} (type 'help')", False
+
+
+def _captured_results(calculator) -> Dict:
+    """calculate_antenna without its console output."""
+    buffer = io.StringIO()
+    with contextlib.redirect_stdout(buffer):
+        results = calculator.calculate_antenna()
+    if results is None:
+        raise ValueError("Frequency must be positive")
+    return results
+
+
+class SessionServer:
+    """Hosts calculator sessions over a newline-delimited text protocol.
+
+    Every connection gets its own Session; designs, reports and the band and
+    material tables are shared. Each command runs to completion on the event
+    loop, so redirecting stdout to capture a report never interleaves sessions.
+    """
+
+    def __init__(self, cache_size: int = 4096, max_sessions: int = 1000):
+        self.cache = DesignCache(cache_size)
+        self.max_sessions = max_sessions
+        self.active = 0
+        self.sessions_total = 0
+        self.commands = 0
+        self._server = None
+
+    async def start(self, host: str = '127.0.0.1', port: int = 7373) -> asyncio.AbstractServer:
+        preload()
+        self._server = await asyncio.start_server(self._serve, host, port, limit=MAX_LINE,
+                                                  backlog=self.max_sessions)
+        return self._server
+
+    @property
+    def port(self) -> Optional[int]:
+        if self._server is None or not self._server.sockets:
+            return None
+        return self._server.sockets[0].getsockname()[1]
+
+    async def close(self):
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+
+    def stats(self) -> Dict:
+        return {
+            'active_sessions': self.active,
+            'total_sessions': self.sessions_total,
+            'commands': self.commands,
+            'cached_entries': len(self.cache),
+            'cache_hits': self.cache.hits,
+            'cache_misses': self.cache.misses
+        }
+
+    async def _serve(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        if self.active >= self.max_sessions:
+            writer.write(b"Error: server is full, try again later\n")
+            await writer.drain()
+            writer.close()
+            return
+        self.active += 1
+        self.sessions_total += 1
+        session = Session(self.sessions_total, self.cache)
+        try:
+            writer.write(f"Non-Isolated Yagi Calculator - session {session.id}\n"
+                         f"Type 'help' for commands.\n{PROMPT}".encode())
+            await writer.drain()
+            while True:
+                try:
+                    line = await reader.readuntil(b"\n")
+                except asyncio.IncompleteReadError as e:
+                    line = e.partial  # last command without a newline, or end of input
+                except asyncio.LimitOverrunError:
+                    await _discard_line(reader)
+                    writer.write(f"Error: line too long\n{PROMPT}".encode())
+                    await writer.drain()
+                    continue
+                if not line:
+                    break
+                self.commands += 1
+                reply, finished = session.handle(line.decode('utf-8', 'replace'))
+                writer.write((reply + "\n" if reply else "").encode())
+                if finished:
+                    await writer.drain()
+                    break
+                writer.write(PROMPT.encode())
+                await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            self.active -= 1
+            writer.close()
+            with contextlib.suppress(ConnectionError):
+                await writer.wait_closed()
+
+
+async def _discard_line(reader: asyncio.StreamReader):
+    """Drop buffered and incoming input up to and including the next newline."""
+    while True:
+        try:
+            await reader.readuntil(b"\n")
+            return
+        except asyncio.LimitOverrunError as e:
+            await reader.readexactly(e.consumed)
+        except asyncio.IncompleteReadError:
+            return
+
+
+async def serve(host: str, port: int, cache_size: int, max_sessions: int):
+    server = SessionServer(cache_size, max_sessions)
+    async with await server.start(host, port) as listener:
+        print(f"Serving calculator sessions on {host}:{server.port} (Ctrl+C to stop)")
+        await listener.serve_forever()
+
+
+def main(argv=None):
+    """Run the session server until interrupted."""
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Multi-session Yagi calculator server")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=7373)
+    parser.add_argument('--cache-size', type=int, default=4096, help="designs kept in the shared cache")
+    parser.add_argument('--max-sessions', type=int, default=1000)
+    args = parser.parse_args(argv)
+    try:
+        asyncio.run(serve(args.host, args.port, args.cache_size, args.max_sessions))
+    except KeyboardInterrupt:
+        print("\nServer stopped")
+        sys.exit(0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,338 @@
+#!/usr/bin/env python3
+"""
+Streaming Design Pipeline
+Generator stages (specs -> evaluate -> filter -> format -> export) that sweep in constant memory
+"""
+
+import itertools
+import os
+import sys
+from array import array
+from collections import deque
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Sequence, TextIO, Tuple
+
+from yagi_batch import (BOOM_MATERIALS, CALCULATORS, ELEMENT_CONDUCTORS, MAX_DIRECTORS, OPTIMIZE_FOR, RESULT_WIDTH,
+                        SCALAR_RESULT_FIELDS, SPEC_FIELDS, SPEC_WIDTH, WIRE_GAUGES, decode_result,
+                        decode_spec, encode_spec, evaluate_batch, make_spec, supports)
+
+DEFAULT_CHUNK_SIZE = 1024
+
+# A chunk pairs packed spec rows with the packed result rows evaluated from them
+Chunk = Tuple[array, array]
+
+CSV_FIELDS = SPEC_FIELDS + SCALAR_RESULT_FIELDS
+
+
+def spec_grid(frequencies: Iterable[float], directors: Iterable[int] = range(0, 11),
+              wire_gauges: Iterable[str] = WIRE_GAUGES, boom_materials: Iterable[str] = BOOM_MATERIALS,
+              optimize_for: Iterable[str] = OPTIMIZE_FOR, boom_diameters_mm: Iterable[float] = (25.0,),
+              calculators: Iterable[str] = ('advanced',), conductors: Iterable[str] = ('copper',),
+              temperatures: Iterable[float] = (20.0,)) -> Iterator[Dict]:
+    """Lazily yield every combination of the given axes as spec dicts.
+
+    Material and optimization combinations a calculator does not model are skipped.
+    """
+    for combo in itertools.product(frequencies, directors, wire_gauges, boom_materials,
+                                   optimize_for, boom_diameters_mm, calculators, conductors, temperatures):
+        if supports(combo[6], combo[3], combo[4]):
+            yield make_spec(*combo)
+
+
+def band_frequencies(band_names: Optional[Sequence[str]] = None, points: str = 'segment_centers',
+                     region: Optional[int] = None) -> List[float]:
+    """Sweep frequencies from the band-plan catalog, in band order and without repeats.
+
+    ``band_names`` of None means every band of the region.
+    """
+    from yagi_bands import DEFAULT_REGION, default_band_plan
+
+    plan = default_band_plan()
+    region = DEFAULT_REGION if region is None else region
+    if band_names is not None:
+        unknown = [name for name in band_names if plan.band(name, region) is None]
+        if unknown:
+            raise ValueError(f"No {', '.join(unknown)} band in ITU Region {region}")
+    frequencies = (frequency for _, _, frequency in plan.sweep_frequencies(region, band_names, points))
+    return list(dict.fromkeys(frequencies))
+
+
+def grid_size(frequencies: Sequence[float], directors: Sequence[int], wire_gauges: Sequence[str],
+              boom_materials: Sequence[str], optimize_for: Sequence[str], boom_diameters_mm: Sequence[float],
+              calculators: Sequence[str], conductors: Sequence[str] = ('copper',),
+              temperatures: Sequence[float] = (20.0,)) -> int:
+    """Number of specs a spec_grid over these axes would yield."""
+    options = sum(1 for calculator in calculators for material in boom_materials for goal in optimize_for
+                  if supports(calculator, material, goal))
+    return (len(frequencies) * len(directors) * len(wire_gauges) * len(boom_diameters_mm) * options *
+            len(conductors) * len(temperatures))
+
+
+def pack(specs: Iterable[Dict], chunk_size: int = DEFAULT_CHUNK_SIZE) -> Iterator[array]:
+    """Group spec dicts into packed arrays of at most ``chunk_size`` rows."""
+    rows = array('d')
+    limit = chunk_size * SPEC_WIDTH
+    for spec in specs:
+        rows.extend(encode_spec(spec))
+        if len(rows) >= limit:
+            yield rows
+            rows = array('d')
+    if rows:
+        yield rows
+
+
+def evaluate_chunks(spec_chunks: Iterable[array], pool=None,
+                    evaluator: Optional[Callable[[array], array]] = None) -> Iterator[Chunk]:
+    """Evaluate packed spec chunks, yielding (specs, results) pairs in order.
+
+    With a SharedMemoryPool the chunks are spread over its workers and at most
+    ``pool.slots`` chunks are in flight; ``evaluator`` replaces the in-process
+    reference evaluation otherwise.
+    """
+    if pool is None:
+        evaluator = evaluator or evaluate_batch
+        for specs in spec_chunks:
+            yield specs, evaluator(specs)
+        return
+
+    in_flight = deque()
+
+    def submitted():
+        for specs in spec_chunks:
+            in_flight.append(specs)
+            yield specs
+
+    for results in pool.imap_chunks(submitted()):
+        yield in_flight.popleft(), results
+
+
+_REFLECTOR_LENGTH = SCALAR_RESULT_FIELDS.index('reflector_length')
+_DRIVEN_LENGTH = SCALAR_RESULT_FIELDS.index('driven_length')
+_REFLECTOR_SPACING = SCALAR_RESULT_FIELDS.index('reflector_spacing')
+_WIRE_DIAMETER = SCALAR_RESULT_FIELDS.index('wire_diameter')
+
+
+def _row_layout(spec_row: Sequence[float], result_row: Sequence[float]):
+    """Element positions and lengths of a packed design, as ElementGeometry.from_yagi lays them out."""
+    n = int(spec_row[1])
+    spacing = result_row[_REFLECTOR_SPACING]
+    base = len(SCALAR_RESULT_FIELDS)
+    positions = [0.0, spacing] + [spacing + d for d in result_row[base + MAX_DIRECTORS:base + MAX_DIRECTORS + n]]
+    lengths = [result_row[_REFLECTOR_LENGTH], result_row[_DRIVEN_LENGTH]] + list(result_row[base:base + n])
+    return positions, lengths
+
+
+def filter_chunks(chunks: Iterable[Chunk], min_gain: Optional[float] = None,
+                  max_boom: Optional[float] = None, min_front_to_back: Optional[float] = None,
+                  predicate: Optional[Callable[[Sequence[float], Sequence[float]], bool]] = None,
+                  wind_speed: Optional[float] = None, min_safety_factor: float = 1.5) -> Iterator[Chunk]:
+    """Keep designs meeting every given limit; ``predicate(spec_row, result_row)`` adds a custom test.
+
+    With ``wind_speed`` (m/s), designs must also pass yagi_mechanics.passes with
+    ``min_safety_factor``, using the spec's boom material and diameter. This runs
+    after the cheaper column limits, so only their survivors are analyzed.
+    Empty chunks are dropped, so downstream stages only see designs that passed.
+    """
+    if wind_speed is not None:
+        from yagi_mechanics import passes
+
+    limits = []
+    if min_gain is not None:
+        limits.append((SCALAR_RESULT_FIELDS.index('gain'), min_gain, None))
+    if min_front_to_back is not None:
+        limits.append((SCALAR_RESULT_FIELDS.index('front_to_back'), min_front_to_back, None))
+    if max_boom is not None:
+        limits.append((SCALAR_RESULT_FIELDS.index('total_boom'), None, max_boom))
+
+    for specs, results in chunks:
+        count = len(specs) // SPEC_WIDTH
+        keep = [True] * count
+        # Test one result column at a time across the whole chunk
+        for column, low, high in limits:
+            values = results[column::RESULT_WIDTH]
+            for i in range(count):
+                if keep[i] and ((low is not None and values[i] < low) or (high is not None and values[i] > high)):
+                    keep[i] = False
+        kept_specs = array('d')
+        kept_results = array('d')
+        for i in range(count):
+            if not keep[i]:
+                continue
+            spec_row = specs[i * SPEC_WIDTH:(i + 1) * SPEC_WIDTH]
+            result_row = results[i * RESULT_WIDTH:(i + 1) * RESULT_WIDTH]
+            if wind_speed is not None:
+                positions, lengths = _row_layout(spec_row, result_row)
+                if not passes(positions, lengths, spec_row[5] / 1000, result_row[_WIRE_DIAMETER], wind_speed,
+                              BOOM_MATERIALS[int(spec_row[3])], min_safety_factor=min_safety_factor):
+                    continue
+            if predicate is not None and not predicate(spec_row, result_row):
+                continue
+            kept_specs.extend(spec_row)
+            kept_results.extend(result_row)
+        if kept_specs:
+            yield kept_specs, kept_results
+
+
+def records(chunks: Iterable[Chunk]) -> Iterator[Dict]:
+    """Unpack chunks into one dict per design holding its spec and results."""
+    for specs, results in chunks:
+        for i in range(len(specs) // SPEC_WIDTH):
+            spec = decode_spec(specs[i * SPEC_WIDTH:(i + 1) * SPEC_WIDTH])
+            record = dict(spec)
+            record.update(decode_result(results[i * RESULT_WIDTH:(i + 1) * RESULT_WIDTH], spec['num_directors']))
+            yield record
+
+
+def format_csv(rows: Iterable[Dict], fields: Sequence[str] = CSV_FIELDS, header: bool = True) -> Iterator[str]:
+    """Format records as CSV lines; director lists are joined with ';'."""
+    import csv
+    import io
+
+    buffer = io.StringIO()
+    writer = csv.writer(buffer, lineterminator='\n')
+
+    def line(values):
+        writer.writerow(values)
+        text = buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate()
+        return text
+
+    if header:
+        yield line(fields)
+    for row in rows:
+        yield line([';'.join(f"{v:.6g}" for v in row[field]) if isinstance(row[field], list)
+                    else f"{row[field]:.6g}" if isinstance(row[field], float) else row[field]
+                    for field in fields])
+
+
+def export(lines: Iterable[str], out: TextIO) -> int:
+    """Write formatted lines to an open file and return how many were written."""
+    count = 0
+    for text in lines:
+        out.write(text)
+        count += 1
+    return count
+
+
+def sweep(specs: Iterable[Dict], out: TextIO, min_gain: Optional[float] = None,
+          max_boom: Optional[float] = None, min_front_to_back: Optional[float] = None,
+          fields: Sequence[str] = CSV_FIELDS, chunk_size: int = DEFAULT_CHUNK_SIZE, pool=None,
+          cache=None, manifest=None, wind_speed: Optional[float] = None, min_safety_factor: float = 1.5) -> int:
+    """Run the whole pipeline into ``out`` and return the number of designs written.
+
+    With a yagi_cache.ChunkCache, chunks evaluated by an earlier run of the same code
+    are read back instead of recomputed; a RunManifest records every chunk.
+    """
+    if cache is not None:
+        from yagi_cache import evaluate_cached
+
+        evaluated = evaluate_cached(pack(specs, chunk_size), cache, pool, manifest)
+    else:
+        evaluated = evaluate_chunks(pack(specs, chunk_size), pool)
+    chunks = filter_chunks(evaluated, min_gain, max_boom, min_front_to_back,
+                           wind_speed=wind_speed, min_safety_factor=min_safety_factor)
+    return export(format_csv(records(chunks), fields), out) - 1
+
+
+def main(argv=None):
+    """Sweep a design grid from the command line and stream matching designs as CSV."""
+    import argparse
+
+    from yagi_bands import DEFAULT_REGION, REGIONS, SWEEP_POINTS
+
+    parser = argparse.ArgumentParser(description="Stream a Yagi design sweep to CSV")
+    source = parser.add_mutually_exclusive_group(required=True)
+    source.add_argument('-f', '--frequencies', help="comma-separated frequencies in MHz")
+    source.add_argument('--bands', help="sweep the band plan: 'all' or band names such as 160m,2m")
+    parser.add_argument('--points', choices=SWEEP_POINTS, default='segment_centers',
+                        help="frequencies taken from each band with --bands")
+    parser.add_argument('--region', type=int, choices=REGIONS, default=DEFAULT_REGION,
+                        help="ITU region of the band plan used with --bands")
+    parser.add_argument('-d', '--directors', default='0-10', help="director count range, e.g. 0-10")
+    parser.add_argument('-g', '--gauges', default=','.join(WIRE_GAUGES))
+    parser.add_argument('-m', '--materials', default=','.join(BOOM_MATERIALS))
+    parser.add_argument('-o', '--optimize', default=','.join(OPTIMIZE_FOR))
+    parser.add_argument('-c', '--calculators', default='advanced', help=f"any of {', '.join(CALCULATORS)}")
+    parser.add_argument('--conductors', default='copper',
+                        help=f"element conductors, any of {', '.join(ELEMENT_CONDUCTORS)}")
+    parser.add_argument('-t', '--temperatures', default='20',
+                        help="comma-separated element temperatures in °C (write -t=-20,40 for negative values)")
+    parser.add_argument('--min-gain', type=float)
+    parser.add_argument('--max-boom', type=float, help="maximum boom length in meters")
+    parser.add_argument('--min-f2b', type=float)
+    parser.add_argument('--wind', type=float, help="only keep designs that survive this wind speed in km/h")
+    parser.add_argument('--min-safety', type=float, default=1.5, help="mechanical safety factor for --wind")
+    parser.add_argument('--workers', type=int, help="evaluate on a shared-memory pool with this many workers")
+    parser.add_argument('--chunk-size', type=int, default=DEFAULT_CHUNK_SIZE)
+    parser.add_argument('--output', help="CSV file (default: stdout)")
+    parser.add_argument('--cache', help="reuse chunk results stored in this directory by earlier runs")
+    parser.add_argument('--manifest', help="write a run manifest (inputs, code version, chunk hashes) here")
+    args = parser.parse_args(argv)
+
+    low, _, high = args.directors.partition('-')
+    directors = range(int(low), int(high or low) + 1)
+    if not directors or directors[0] < 0 or directors[-1] > MAX_DIRECTORS:
+        parser.error(f"director range must be within 0-{MAX_DIRECTORS}")
+    if args.bands:
+        try:
+            frequencies = band_frequencies(None if args.bands == 'all' else args.bands.split(','),
+                                           args.points, args.region)
+        except ValueError as e:
+            parser.error(str(e))
+    else:
+        frequencies = [float(f) for f in args.frequencies.split(',')]
+    axes = (frequencies,
+            directors,
+            args.gauges.split(','), args.materials.split(','), args.optimize.split(','),
+            (25.0,), args.calculators.split(','), args.conductors.split(','),
+            [float(t) for t in args.temperatures.split(',')])
+    specs = spec_grid(*axes)
+
+    cache = manifest = None
+    if args.cache or args.manifest:
+        from yagi_cache import ChunkCache, RunManifest
+
+        cache = ChunkCache(args.cache or os.path.join(os.path.dirname(args.manifest) or '.', '.yagi_cache'))
+        manifest = RunManifest({'frequencies': axes[0], 'bands': args.bands,
+                                'band_points': args.points if args.bands else None,
+                                'region': args.region if args.bands else None,
+                                'directors': args.directors, 'gauges': axes[2],
+                                'materials': axes[3], 'optimize_for': axes[4], 'boom_diameters_mm': list(axes[5]),
+                                'calculators': axes[6], 'conductors': axes[7], 'temperatures': axes[8],
+                                'min_gain': args.min_gain, 'max_boom': args.max_boom,
+                                'min_f2b': args.min_f2b, 'wind_kmh': args.wind,
+                                'min_safety': args.min_safety}, args.chunk_size)
+
+    wind_speed = None
+    if args.wind is not None:
+        from yagi_mechanics import kmh_to_ms
+
+        wind_speed = kmh_to_ms(args.wind)
+    out = open(args.output, 'w', newline='') if args.output else sys.stdout
+    try:
+        if args.workers:
+            from yagi_pool import SharedMemoryPool
+
+            with SharedMemoryPool(workers=args.workers, chunk_size=args.chunk_size) as pool:
+                written = sweep(specs, out, args.min_gain, args.max_boom, args.min_f2b,
+                                chunk_size=args.chunk_size, pool=pool, cache=cache, manifest=manifest,
+                                wind_speed=wind_speed, min_safety_factor=args.min_safety)
+        else:
+            written = sweep(specs, out, args.min_gain, args.max_boom, args.min_f2b,
+                            chunk_size=args.chunk_size, cache=cache, manifest=manifest,
+                            wind_speed=wind_speed, min_safety_factor=args.min_safety)
+    except ValueError as e:
+        print(f"Error: {e}", file=sys.stderr)
+        sys.exit(1)
+    finally:
+        if args.output:
+            out.close()
+    print(f"{written} of {grid_size(*axes)} designs written", file=sys.stderr)
+    if cache is not None:
+        print(f"{cache.hits} chunks reused from cache, {cache.misses} computed", file=sys.stderr)
+    if args.manifest:
+        manifest.save(args.manifest)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,322 @@
+#!/usr/bin/env python3
+"""
+Design-Response Surrogate
+Polynomial least-squares models of gain, F/B, beamwidth and impedance with a reference fallback
+"""
+
+import math
+from array import array
+from itertools import combinations_with_replacement
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+from yagi_batch import (CALCULATORS, OPTIMIZE_FOR, RESULT_WIDTH, SCALAR_RESULT_FIELDS, SPEC_WIDTH, WIRE_GAUGES,
+                        decode_spec, encode_specs, evaluate, evaluate_batch, make_spec, supports)
+
+TARGETS = ('gain', 'front_to_back', 'beamwidth', 'input_impedance')
+TARGET_WIDTH = len(TARGETS)
+
+# Continuous inputs per calculator, as (name, spec row column); the advanced
+# calculator ignores the boom diameter, so it is not part of its domain
+FEATURES = {
+    'advanced': (('log_frequency', 0), ('num_directors', 1), ('wire_awg', 2)),
+    'non_isolated': (('log_frequency', 0), ('num_directors', 1), ('wire_awg', 2),
+                     ('boom_diameter_mm', 5))
+}
+
+_TARGET_COLUMNS = tuple(SCALAR_RESULT_FIELDS.index(target) for target in TARGETS)
+_MODEL_FORMAT = 1
+
+
+def _feature_value(row: Sequence[float], column: int) -> float:
+    """Continuous feature from a packed spec row."""
+    if column == 0:
+        return math.log10(row[0])
+    if column == 2:
+        return float(WIRE_GAUGES[int(row[2])])
+    return row[column]
+
+
+def _exponents(max_powers: Sequence[int], degree: int) -> List[Tuple[int, int]]:
+    """Monomials up to ``degree`` as (parent term, multiplying feature) pairs.
+
+    Term 0 is the constant; every other term is an earlier term times one feature,
+    so a whole feature vector is built with one multiplication per term. Feature j
+    appears at most ``max_powers[j]`` times in a term.
+    """
+    terms = [()]
+    recipe = [(-1, -1)]
+    index = {(): 0}
+    for d in range(1, degree + 1):
+        for combo in combinations_with_replacement(range(len(max_powers)), d):
+            if any(combo.count(j) > power for j, power in enumerate(max_powers)):
+                continue
+            index[combo] = len(terms)
+            recipe.append((index[combo[:-1]], combo[-1]))
+            terms.append(combo)
+    return recipe
+
+
+def _solve(matrix: List[List[float]], vectors: List[List[float]]) -> List[List[float]]:
+    """Solve matrix @ x = v for each v by Gaussian elimination with partial pivoting."""
+    n = len(matrix)
+    a = [row[:] + [v[i] for v in vectors] for i, row in enumerate(matrix)]
+    width = n + len(vectors)
+    for col in range(n):
+        pivot = max(range(col, n), key=lambda r: abs(a[r][col]))
+        a[col], a[pivot] = a[pivot], a[col]
+        p = a[col][col]
+        if p == 0:
+            continue
+        for r in range(col + 1, n):
+            factor = a[r][col] / p
+            if factor:
+                ar, ac = a[r], a[col]
+                for c in range(col, width):
+                    ar[c] -= factor * ac[c]
+    solutions = []
+    for k in range(len(vectors)):
+        x = [0.0] * n
+        for r in range(n - 1, -1, -1):
+            p = a[r][r]
+            s = a[r][n + k] - sum(a[r][c] * x[c] for c in range(r + 1, n))
+            x[r] = s / p if p else 0.0
+        solutions.append(x)
+    return solutions
+
+
+class PolynomialModel:
+    """Least-squares polynomial over normalized features for one calculator / optimization goal."""
+
+    def __init__(self, features: Sequence[str], low: Sequence[float], high: Sequence[float],
+                 degree: int, coefficients: Sequence[Sequence[float]], validation: Dict[str, Dict[str, float]],
+                 samples: int, max_powers: Optional[Sequence[int]] = None):
+        self.features = tuple(features)
+        self.low = tuple(low)
+        self.high = tuple(high)
+        self.degree = degree
+        self.coefficients = [array('d', c) for c in coefficients]
+        self.validation = validation
+        self.samples = samples
+        self.max_powers = tuple(max_powers) if max_powers is not None else (degree,) * len(self.features)
+        self._recipe = _exponents(self.max_powers, degree)
+        self._center = [(lo + hi) / 2 for lo, hi in zip(self.low, self.high)]
+        self._scale = [(hi - lo) / 2 or 1.0 for lo, hi in zip(self.low, self.high)]
+
+    def contains(self, values: Sequence[float]) -> bool:
+        """True when every feature lies inside the trained range."""
+        for value, lo, hi in zip(values, self.low, self.high):
+            if not lo - 1e-9 <= value <= hi + 1e-9:
+                return False
+        return True
+
+    def terms(self, values: Sequence[float]) -> List[float]:
+        """Polynomial feature vector for raw feature values."""
+        x = [(v - c) / s for v, c, s in zip(values, self._center, self._scale)]
+        out = [1.0]
+        for parent, feature in self._recipe[1:]:
+            out.append(out[parent] * x[feature])
+        return out
+
+    def predict(self, values: Sequence[float]) -> List[float]:
+        """Predicted TARGETS for raw feature values."""
+        t = self.terms(values)
+        return [sum(c * v for c, v in zip(coefficients, t)) for coefficients in self.coefficients]
+
+    @classmethod
+    def fit(cls, features: Sequence[str], inputs: Sequence[Sequence[float]], outputs: Sequence[Sequence[float]],
+            degree: int = 3, holdout: int = 5, ridge: float = 1e-9) -> 'PolynomialModel':
+        """Fit on all but every ``holdout``-th sample and record the error on those held out.
+
+        A feature sampled at k distinct values is limited to powers below k, so sparse
+        grid axes do not get an unconstrained polynomial between the samples.
+        """
+        if len(inputs) < 2:
+            raise ValueError("Need at least two samples to fit a surrogate")
+        low = [min(row[j] for row in inputs) for j in range(len(features))]
+        high = [max(row[j] for row in inputs) for j in range(len(features))]
+        max_powers = [min(degree, len({row[j] for row in inputs}) - 1) for j in range(len(features))]
+        model = cls(features, low, high, degree, [[0.0]] * TARGET_WIDTH, {}, len(inputs), max_powers)
+        held = [i for i in range(len(inputs)) if holdout > 1 and i % holdout == holdout - 1]
+        train = [i for i in range(len(inputs)) if not (holdout > 1 and i % holdout == holdout - 1)]
+        held = held or train
+
+        # Normal equations with a tiny ridge term to keep rank-deficient grids solvable
+        n = len(model._recipe)
+        gram = [[0.0] * n for _ in range(n)]
+        rhs = [[0.0] * n for _ in range(TARGET_WIDTH)]
+        for i in train:
+            t = model.terms(inputs[i])
+            for r in range(n):
+                tr = t[r]
+                row = gram[r]
+                for c in range(r, n):
+                    row[c] += tr * t[c]
+                for k in range(TARGET_WIDTH):
+                    rhs[k][r] += tr * outputs[i][k]
+        for r in range(n):
+            gram[r][r] += ridge * len(train)
+            for c in range(r):
+                gram[r][c] = gram[c][r]
+        model.coefficients = [array('d', c) for c in _solve(gram, rhs)]
+
+        validation = {}
+        for k, target in enumerate(TARGETS):
+            errors = [model.predict(inputs[i])[k] - outputs[i][k] for i in held]
+            validation[target] = {
+                'rmse': math.sqrt(sum(e * e for e in errors) / len(errors)),
+                'max_error': max(abs(e) for e in errors)
+            }
+        model.validation = validation
+        return model
+
+    def to_dict(self) -> Dict:
+        return {
+            'features': list(self.features), 'low': list(self.low), 'high': list(self.high),
+            'degree': self.degree, 'coefficients': [list(c) for c in self.coefficients],
+            'validation': self.validation, 'samples': self.samples, 'max_powers': list(self.max_powers)
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> 'PolynomialModel':
+        return cls(data['features'], data['low'], data['high'], data['degree'],
+                   data['coefficients'], data['validation'], data['samples'], data['max_powers'])
+
+
+class DesignSurrogate:
+    """Per-(calculator, optimize_for) surrogate models with a reference-calculator fallback.
+
+    Designs whose calculator or goal was never trained, whose features fall outside
+    the trained range, or whose model misses ``tolerance`` on validation are
+    evaluated with the reference calculator instead.
+    """
+
+    def __init__(self, models: Dict[Tuple[str, str], PolynomialModel], tolerance: Optional[float] = None):
+        self.models = dict(models)
+        self.tolerance = tolerance
+
+    def _model_for(self, calculator: str, optimize_for: str) -> Optional[PolynomialModel]:
+        model = self.models.get((calculator, optimize_for))
+        if model is None:
+            return None
+        if self.tolerance is not None and any(v['max_error'] > self.tolerance
+                                              for v in model.validation.values()):
+            return None
+        return model
+
+    def validation(self) -> Dict[str, Dict[str, Dict[str, float]]]:
+        """Stored hold-out errors keyed by 'calculator/optimize_for' and target."""
+        return {f"{c}/{o}": model.validation for (c, o), model in self.models.items()}
+
+    def predict(self, spec: Dict) -> Dict:
+        """Estimated TARGETS for one spec dict, with 'source' set to 'surrogate' or 'reference'."""
+        rows = encode_specs([spec])
+        out, mask = self.predict_batch(rows)
+        result = dict(zip(TARGETS, out))
+        result['source'] = 'surrogate' if mask[0] else 'reference'
+        return result
+
+    def predict_batch(self, specs: Sequence[float]) -> Tuple[array, array]:
+        """Estimate TARGETS for packed spec rows.
+
+        Returns a flat array of TARGET_WIDTH values per design and a mask (1 = served
+        by the surrogate, 0 = evaluated with the reference calculator).
+        """
+        count = len(specs) // SPEC_WIDTH
+        out = array('d', bytes(8 * TARGET_WIDTH * count))
+        mask = array('b', bytes(count))
+        resolved = {}
+        for i in range(count):
+            s = i * SPEC_WIDTH
+            row = specs[s:s + SPEC_WIDTH]
+            key = (int(row[6]), int(row[4]))
+            if key not in resolved:
+                calculator = CALCULATORS[key[0]]
+                resolved[key] = (self._model_for(calculator, OPTIMIZE_FOR[key[1]]), FEATURES[calculator])
+            model, columns = resolved[key]
+            o = i * TARGET_WIDTH
+            if model is not None:
+                values = [_feature_value(row, column) for _, column in columns]
+                if model.contains(values):
+                    out[o:o + TARGET_WIDTH] = array('d', model.predict(values))
+                    mask[i] = 1
+                    continue
+            results = evaluate(decode_spec(row))
+            out[o:o + TARGET_WIDTH] = array('d', (results[target] for target in TARGETS))
+        return out, mask
+
+    def to_dict(self) -> Dict:
+        return {
+            'format': _MODEL_FORMAT,
+            'tolerance': self.tolerance,
+            'models': [{'calculator': c, 'optimize_for': o, 'model': model.to_dict()}
+                       for (c, o), model in sorted(self.models.items())]
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> 'DesignSurrogate':
+        if data.get('format') != _MODEL_FORMAT:
+            raise ValueError("Unsupported surrogate model format")
+        models = {(entry['calculator'], entry['optimize_for']): PolynomialModel.from_dict(entry['model'])
+                  for entry in data['models']}
+        return cls(models, data.get('tolerance'))
+
+    def save(self, path: str):
+        """Write the models and their validation errors as JSON."""
+        import json
+
+        with open(path, 'w') as f:
+            json.dump(self.to_dict(), f)
+
+
+def load_surrogate(path: str) -> DesignSurrogate:
+    """Read a surrogate written by DesignSurrogate.save."""
+    import json
+
+    with open(path) as f:
+        return DesignSurrogate.from_dict(json.load(f))
+
+
+def sweep_specs(frequencies: Sequence[float] = (14.2, 28.5, 50.1, 144.3, 432.1, 1296.0),
+                directors: Iterable[int] = range(0, 16),
+                wire_gauges: Sequence[str] = WIRE_GAUGES,
+                optimize_for: Sequence[str] = OPTIMIZE_FOR,
+                boom_diameters_mm: Sequence[float] = (15.0, 25.0, 40.0),
+                calculators: Sequence[str] = CALCULATORS) -> List[Dict]:
+    """Training grid; boom diameters only vary for the calculator that uses them, and modes a calculator lacks are skipped."""
+    directors = list(directors)
+    specs = []
+    for calculator in calculators:
+        diameters = boom_diameters_mm if 'boom_diameter_mm' in dict(FEATURES[calculator]) else (25.0,)
+        for goal in optimize_for:
+            if not supports(calculator, 'aluminum', goal):
+                continue
+            for frequency in frequencies:
+                for n in directors:
+                    for gauge in wire_gauges:
+                        for diameter in diameters:
+                            specs.append(make_spec(frequency, n, gauge, 'aluminum', goal, diameter, calculator))
+    return specs
+
+
+def fit_surrogate(specs: Sequence[float], results: Sequence[float], degree: int = 3,
+                  holdout: int = 5, tolerance: Optional[float] = None) -> DesignSurrogate:
+    """Fit models from packed spec rows and the matching packed yagi_batch result rows."""
+    groups = {}
+    for i in range(len(specs) // SPEC_WIDTH):
+        row = specs[i * SPEC_WIDTH:(i + 1) * SPEC_WIDTH]
+        calculator = CALCULATORS[int(row[6])]
+        key = (calculator, OPTIMIZE_FOR[int(row[4])])
+        inputs, outputs = groups.setdefault(key, ([], []))
+        inputs.append([_feature_value(row, column) for _, column in FEATURES[calculator]])
+        outputs.append([results[i * RESULT_WIDTH + column] for column in _TARGET_COLUMNS])
+    models = {key: PolynomialModel.fit([name for name, _ in FEATURES[key[0]]], inputs, outputs, degree, holdout)
+              for key, (inputs, outputs) in groups.items()}
+    return DesignSurrogate(models, tolerance)
+
+
+def train_surrogate(specs: Optional[Sequence[Dict]] = None, pool=None, degree: int = 3,
+                    holdout: int = 5, tolerance: Optional[float] = None) -> DesignSurrogate:
+    """Evaluate a sweep with the reference calculators (optionally on a SharedMemoryPool) and fit it."""
+    rows = encode_specs(sweep_specs() if specs is None else specs)
+    results = pool.evaluate(rows) if pool is not None else evaluate_batch(rows)
+    return fit_surrogate(rows, results, degree, holdout, tolerance)